@@ -1,2 +1,17 @@
+from importlib import import_module
+from typing import Any
+
+__all__ = ["components", "database", "services", "utils"]
+
+
+def __getattr__(name: str) -> Any:
+    """Import subpackages on first access (PEP 562) to keep startup cheap."""
+    if name in __all__:
+        module = import_module(f".{name}", __name__)
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def hello() -> str:
     return "Hello from gui!"
@@ -0,0 +1,20 @@
+from ..utils.lazy import lazy_exports
+
+_EXPORTS = {
+    "Base": ".base",
+    "BaseModel": ".base",
+    "Controller": ".base",
+    "CRUD": ".crud",
+    "CRUDAsync": ".crud",
+    "CRUDSync": ".crud",
+    "PurgeJob": ".maintenance",
+    "Conversation": ".models",
+    "Message": ".models",
+    "Rule": ".models",
+    "SystemPrompt": ".models",
+    "Template": ".models",
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__ = lazy_exports(__name__, _EXPORTS)
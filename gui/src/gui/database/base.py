@@ -1,24 +1,65 @@
 from typing import Any, Optional, Union
 
-from sqlalchemy import Column, DateTime, Integer, create_engine
+from sqlalchemy import Column, DateTime, Index, Integer, create_engine, text
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.inspection import inspect
 from sqlalchemy.orm import declarative_base, scoped_session, sessionmaker
+from sqlalchemy.sql.expression import FunctionElement
 
+from ..utils.metrics import metrics
 from ..utils.time import Date
 
 Base = declarative_base()
 
 
+def live_index(name: str, *columns: str, unique: bool = False) -> Index:
+    """Partial index over rows that are not soft-deleted (`deleted_at IS NULL`)."""
+    where = text("deleted_at IS NULL")
+    return Index(
+        name, *columns, unique=unique, sqlite_where=where, postgresql_where=where
+    )
+
+
+class utcnow(FunctionElement):
+    """
+    Current UTC time at the precision `Date.datetime` writes.
+
+    `func.now()` is second-precision on SQLite and server-local time on
+    PostgreSQL, so rows inserted outside the ORM would sort before ORM rows
+    written in the same second.
+    """
+
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _utcnow_default(element, compiler, **kw) -> str:
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(utcnow, "sqlite")
+def _utcnow_sqlite(element, compiler, **kw) -> str:
+    # Same text layout as SQLAlchemy's SQLite DateTime: microseconds, 6 digits.
+    return "strftime('%Y-%m-%d %H:%M:%f000', 'now')"
+
+
+@compiles(utcnow, "postgresql")
+def _utcnow_postgresql(element, compiler, **kw) -> str:
+    return "timezone('utc', now())"
+
+
 class Controller:
     """Database controller for both sync and async operations."""
 
     def _create_engine(self, echo: bool) -> Union[AsyncEngine, Any]:
-        return (
+        engine = (
             create_engine(self.url, echo=echo)
             if self.sync
             else create_async_engine(self.url, echo=echo, future=True)
         )
+        return metrics.instrument_engine(engine)
 
     def _create_session(self) -> Union[scoped_session, sessionmaker]:
         if self.sync:
@@ -31,8 +72,22 @@ class Controller:
     ):
         self.url = url
         self.sync = sync
-        self.engine = self._create_engine(echo)
-        self.session = self._create_session()
+        self.echo = echo
+        self._engine: Optional[Union[AsyncEngine, Any]] = None
+        self._session: Optional[Union[scoped_session, sessionmaker]] = None
+
+    @property
+    def engine(self) -> Union[AsyncEngine, Any]:
+        """Engine (and its pool), created on first use."""
+        if self._engine is None:
+            self._engine = self._create_engine(self.echo)
+        return self._engine
+
+    @property
+    def session(self) -> Union[scoped_session, sessionmaker]:
+        if self._session is None:
+            self._session = self._create_session()
+        return self._session
 
     def create_all(self):
         """Create all tables from Base metadata (only works in sync mode)."""
@@ -50,9 +105,19 @@ class BaseModel(Base):
     __abstract__ = True
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    created_at = Column(DateTime, default=Date.datetime())
-    updated_at = Column(DateTime, default=Date.datetime(), onupdate=Date.datetime())
-    deleted_at = Column(DateTime, nullable=True)
+    # Callables (not values) so every row gets its own timestamp; the server
+    # default covers rows inserted outside the ORM.
+    created_at = Column(
+        DateTime, default=Date.datetime, server_default=utcnow(), index=True
+    )
+    updated_at = Column(
+        DateTime,
+        default=Date.datetime,
+        onupdate=Date.datetime,
+        server_default=utcnow(),
+        index=True,
+    )
+    deleted_at = Column(DateTime, nullable=True, index=True)
 
     def to_dict(self, exclude: Optional[list[str]] = None) -> dict:
         exclude = set(exclude or [])
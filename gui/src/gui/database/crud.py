@@ -1,9 +1,22 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union, Sequence
-
-from sqlalchemy import create_engine, select
+import datetime
+from typing import (
+    Any,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Type,
+    TypeVar,
+    Union,
+)
+
+from sqlalchemy import and_, create_engine, delete, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
 
+from ..utils.metrics import metrics
 from ..utils.time import Date
 from .base import BaseModel
 
@@ -21,14 +34,22 @@ class BaseCRUD(Generic[T]):
         offset = (page - 1) * limit
         return offset, limit
 
+    def statement_select(self, include_deleted: bool = False):
+        """`SELECT` over live rows; soft-deleted rows only when asked for."""
+        stmt = select(self.model)
+        if include_deleted:
+            return stmt
+        return stmt.where(self.model.deleted_at.is_(None))
+
     def statement_filter(
         self,
         page: int = 1,
         items_per_page: int = 10,
         conditions: Optional[Sequence[Any]] = None,
+        include_deleted: bool = False,
     ):
         offset, limit = self.paginate(page, items_per_page)
-        stmt = select(self.model)
+        stmt = self.statement_select(include_deleted)
         if conditions:
             stmt = stmt.filter(*conditions)
         return stmt.offset(offset).limit(limit)
@@ -38,12 +59,93 @@ class BaseCRUD(Generic[T]):
         filters: Dict[str, Any],
         page: int = 1,
         items_per_page: int = 10,
+        include_deleted: bool = False,
     ):
         offset, limit = self.paginate(page, items_per_page)
-        return select(self.model).filter_by(**filters).offset(offset).limit(limit)
+        stmt = self.statement_select(include_deleted).filter_by(**filters)
+        return stmt.offset(offset).limit(limit)
 
-    def statement_get(self, id: Any):
-        return select(self.model).where(self.model.id == id)
+    def statement_get(self, id: Any, include_deleted: bool = False):
+        return self.statement_select(include_deleted).where(self.model.id == id)
+
+    def statement_purge(self, before: datetime.datetime, batch_size: int):
+        """Ids of one batch of tombstones soft-deleted before `before`."""
+        model = self.model
+        return (
+            select(model.id)
+            .where(model.deleted_at.is_not(None), model.deleted_at < before)
+            .limit(batch_size)
+        )
+
+    def statement_delete_ids(self, ids: Sequence[Any]):
+        return delete(self.model).where(self.model.id.in_(ids))
+
+    def statement_delete_dependents(self, ids: Sequence[Any]) -> List[Any]:
+        """
+        `DELETE`s for rows cascading from `ids` (`ondelete="CASCADE"`), innermost first.
+
+        Run before `statement_delete_ids` so purging does not depend on the
+        database enforcing the cascade (SQLite only does with
+        `PRAGMA foreign_keys=ON`).
+        """
+
+        def dependents(table, doomed) -> Iterator[Any]:
+            for child in table.metadata.sorted_tables:
+                for fk in child.foreign_keys:
+                    if child is table or fk.column.table is not table:
+                        continue
+                    if (fk.ondelete or "").upper() != "CASCADE":
+                        continue
+                    where = fk.parent.in_(select(fk.column).where(doomed))
+                    yield from dependents(child, where)
+                    yield delete(child).where(where)
+
+        table = self.model.__table__
+        return list(dependents(table, table.c.id.in_(ids)))
+
+    def statement_changed_since(
+        self,
+        since: Optional[datetime.datetime] = None,
+        after_id: int = 0,
+        limit: Optional[int] = None,
+    ):
+        """
+        Rows touched after the `(since, after_id)` cursor, oldest first.
+
+        Keyset pagination on `(updated_at, id)`: pass the last row's
+        `updated_at` and `id` back in to fetch the next page. Soft-deleted
+        rows are included so consumers can drop them from caches and indexes.
+        """
+        model = self.model
+        stmt = select(model).order_by(model.updated_at, model.id)
+        if since is not None:
+            stmt = stmt.where(
+                or_(
+                    model.updated_at > since,
+                    and_(model.updated_at == since, model.id > after_id),
+                )
+            )
+        return stmt.limit(min(limit or self.max_per_page, self.max_per_page))
+
+    def _purge(
+        self, db: Session, before: datetime.datetime, batch_size: int
+    ) -> int:
+        """
+        Hard-delete tombstones older than `before`, one short transaction per batch.
+
+        Written once against a sync `Session`; `CRUDAsync` runs it through
+        `AsyncSession.run_sync`.
+        """
+        purged = 0
+        while ids := db.scalars(self.statement_purge(before, batch_size)).all():
+            for stmt in self.statement_delete_dependents(ids):
+                db.execute(stmt)
+            db.execute(self.statement_delete_ids(ids))
+            db.commit()
+            purged += len(ids)
+            if len(ids) < batch_size:
+                break
+        return purged
 
     def create_instance(self, obj_in: Dict[str, Any]) -> T:
         return self.model(**obj_in)
@@ -61,21 +163,36 @@ class CRUDAsync(BaseCRUD[T]):
         page: int = 1,
         items_per_page: int = 10,
         conditions: Optional[Sequence[Any]] = None,
+        include_deleted: bool = False,
     ) -> List[T]:
         result = await db.execute(
-            self.statement_filter(page, items_per_page, conditions)
+            self.statement_filter(page, items_per_page, conditions, include_deleted)
         )
         return result.scalars().all()
 
-    async def filter_by(self, db: AsyncSession, filters: Dict[str, Any]) -> List[T]:
-        stmt = self.statement_filter_by(filters)
+    async def filter_by(
+        self, db: AsyncSession, filters: Dict[str, Any], include_deleted: bool = False
+    ) -> List[T]:
+        stmt = self.statement_filter_by(filters, include_deleted=include_deleted)
         result = await db.execute(stmt)
         return result.scalars().all()
 
-    async def detail(self, db: AsyncSession, id: Any) -> Optional[T]:
-        result = await db.execute(self.statement_get(id))
+    async def detail(
+        self, db: AsyncSession, id: Any, include_deleted: bool = False
+    ) -> Optional[T]:
+        result = await db.execute(self.statement_get(id, include_deleted))
         return result.scalar_one_or_none()
 
+    async def changed_since(
+        self,
+        db: AsyncSession,
+        since: Optional[datetime.datetime] = None,
+        after_id: int = 0,
+        limit: Optional[int] = None,
+    ) -> List[T]:
+        result = await db.execute(self.statement_changed_since(since, after_id, limit))
+        return result.scalars().all()
+
     async def create(self, db: AsyncSession, obj_in: Dict[str, Any]) -> T:
         db_obj = self.create_instance(obj_in)
         db.add(db_obj)
@@ -83,10 +200,20 @@ class CRUDAsync(BaseCRUD[T]):
         await db.refresh(db_obj)
         return db_obj
 
+    async def bulk_create(
+        self, db: AsyncSession, objs_in: List[Dict[str, Any]]
+    ) -> None:
+        db.add_all([self.create_instance(obj_in) for obj_in in objs_in])
+        await db.commit()
+
     async def update(
-        self, db: AsyncSession, id: Any, obj_in: Dict[str, Any]
+        self,
+        db: AsyncSession,
+        id: Any,
+        obj_in: Dict[str, Any],
+        include_deleted: bool = False,
     ) -> Optional[T]:
-        db_obj = await self.detail(db, id)
+        db_obj = await self.detail(db, id, include_deleted)
         if not db_obj:
             return None
         self.update_instance(db_obj, obj_in)
@@ -95,7 +222,7 @@ class CRUDAsync(BaseCRUD[T]):
         return db_obj
 
     async def delete(self, db: AsyncSession, id: Any) -> bool:
-        obj = await self.detail(db, id)
+        obj = await self.detail(db, id, include_deleted=True)
         if obj:
             await db.delete(obj)
             await db.commit()
@@ -110,6 +237,14 @@ class CRUDAsync(BaseCRUD[T]):
             return True
         return False
 
+    async def purge_deleted(
+        self,
+        db: AsyncSession,
+        before: datetime.datetime,
+        batch_size: int = 500,
+    ) -> int:
+        return await db.run_sync(self._purge, before, batch_size)
+
 
 class CRUDSync(BaseCRUD[T]):
     def filter(
@@ -118,14 +253,30 @@ class CRUDSync(BaseCRUD[T]):
         page: int = 1,
         items_per_page: int = 10,
         conditions: Optional[Sequence[Any]] = None,
+        include_deleted: bool = False,
     ) -> List[T]:
-        return db.scalars(self.statement_filter(page, items_per_page, conditions)).all()
+        stmt = self.statement_filter(page, items_per_page, conditions, include_deleted)
+        return db.scalars(stmt).all()
 
-    def filter_by(self, db: Session, filters: Dict[str, Any]) -> List[T]:
-        return db.scalars(self.statement_filter_by(filters)).all()
+    def filter_by(
+        self, db: Session, filters: Dict[str, Any], include_deleted: bool = False
+    ) -> List[T]:
+        stmt = self.statement_filter_by(filters, include_deleted=include_deleted)
+        return db.scalars(stmt).all()
 
-    def detail(self, db: Session, id: Any) -> Optional[T]:
-        return db.scalar(self.statement_get(id))
+    def detail(
+        self, db: Session, id: Any, include_deleted: bool = False
+    ) -> Optional[T]:
+        return db.scalar(self.statement_get(id, include_deleted))
+
+    def changed_since(
+        self,
+        db: Session,
+        since: Optional[datetime.datetime] = None,
+        after_id: int = 0,
+        limit: Optional[int] = None,
+    ) -> List[T]:
+        return db.scalars(self.statement_changed_since(since, after_id, limit)).all()
 
     def create(self, db: Session, obj_in: Dict[str, Any]) -> T:
         db_obj = self.create_instance(obj_in)
@@ -134,8 +285,18 @@ class CRUDSync(BaseCRUD[T]):
         db.refresh(db_obj)
         return db_obj
 
-    def update(self, db: Session, id: Any, obj_in: Dict[str, Any]) -> Optional[T]:
-        db_obj = self.detail(db, id)
+    def bulk_create(self, db: Session, objs_in: List[Dict[str, Any]]) -> None:
+        db.add_all([self.create_instance(obj_in) for obj_in in objs_in])
+        db.commit()
+
+    def update(
+        self,
+        db: Session,
+        id: Any,
+        obj_in: Dict[str, Any],
+        include_deleted: bool = False,
+    ) -> Optional[T]:
+        db_obj = self.detail(db, id, include_deleted)
         if not db_obj:
             return None
         self.update_instance(db_obj, obj_in)
@@ -144,7 +305,7 @@ class CRUDSync(BaseCRUD[T]):
         return db_obj
 
     def delete(self, db: Session, id: Any) -> bool:
-        obj = self.detail(db, id)
+        obj = self.detail(db, id, include_deleted=True)
         if obj:
             db.delete(obj)
             db.commit()
@@ -159,6 +320,11 @@ class CRUDSync(BaseCRUD[T]):
             return True
         return False
 
+    def purge_deleted(
+        self, db: Session, before: datetime.datetime, batch_size: int = 500
+    ) -> int:
+        return self._purge(db, before, batch_size)
+
 
 class CRUD:
     """
@@ -183,7 +349,7 @@ class CRUD:
             if self.sync
             else create_async_engine(url, echo=echo, future=True)
         )
-        self._engine = engine
+        self._engine = metrics.instrument_engine(engine)
         return engine
 
     def session(self, engine: Any):
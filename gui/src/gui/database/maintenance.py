@@ -0,0 +1,67 @@
+import asyncio
+import datetime
+import logging
+from typing import Any, Optional, Sequence, Type
+
+from ..utils.metrics import metrics
+from ..utils.time import Date
+from .crud import CRUDAsync
+
+logger = logging.getLogger("database_maintenance")
+
+
+class PurgeJob:
+    """
+    Background job that hard-deletes old soft-deleted rows.
+
+    Tombstones older than `retention` are removed in batches of `batch_size`,
+    each in its own short transaction, so live traffic is never blocked for
+    long and live-row queries stay fast as deletes pile up.
+    """
+
+    def __init__(
+        self,
+        session: Any,
+        models: Sequence[Type[Any]],
+        retention: datetime.timedelta = datetime.timedelta(days=30),
+        batch_size: int = 500,
+        interval: float = 3600,
+    ):
+        self.session = session
+        self.cruds = [CRUDAsync(model) for model in models]
+        self.retention = retention
+        self.batch_size = batch_size
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def run_once(self) -> dict[str, int]:
+        before = Date.datetime() - self.retention
+        purged: dict[str, int] = {}
+        for crud in self.cruds:
+            table = crud.model.__tablename__
+            with metrics.timer("db_purge_seconds", table=table):
+                async with self.session() as db:
+                    count = await crud.purge_deleted(db, before, self.batch_size)
+            metrics.inc("db_purged_rows_total", count, table=table)
+            purged[table] = count
+        return purged
+
+    async def run_forever(self) -> None:
+        while True:
+            try:
+                purged = await self.run_once()
+                logger.info(f"Purged tombstones: {purged}")
+            except Exception as e:
+                logger.error(f"Purge failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> asyncio.Task:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run_forever())
+        return self._task
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
@@ -1,17 +1,27 @@
 import json
 
-from sqlalchemy import Column, Enum, Integer, String, Text, create_engine
+from sqlalchemy import (
+    Column,
+    Enum,
+    ForeignKey,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+    create_engine,
+)
 
-from .base import BaseModel
+from .base import BaseModel, live_index
 
 
 class SystemPrompt(BaseModel):
     """Model for storing system prompts."""
 
     __tablename__ = "system_prompts"
+    __table_args__ = (live_index("ix_system_prompts_live_name", "name", unique=True),)
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    name = Column(String, primary_key=True)
+    name = Column(String, nullable=False)
     text = Column(Text, nullable=False)
 
     def to_dict(self):
@@ -22,9 +32,19 @@ class Rule(BaseModel):
     """Model for storing business rules."""
 
     __tablename__ = "rules"
+    __table_args__ = (
+        live_index("ix_rules_live_type", "type"),
+        live_index("ix_rules_live_name", "name", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    type = Column(Enum("always", "manual", name="rule_types"), nullable=False)
+    name = Column(String, nullable=True)
+    type = Column(
+        Enum("always", "auto", "agent", "manual", name="rule_types"), nullable=False
+    )
+    description = Column(Text, nullable=True)
+    globs = Column(Text, nullable=False, default="[]")
+    checksum = Column(String, nullable=True)
     content = Column(Text, nullable=False)
 
 
@@ -32,9 +52,43 @@ class Template(BaseModel):
     """Model for storing prompt templates."""
 
     __tablename__ = "templates"
+    __table_args__ = (live_index("ix_templates_live_name", "name", unique=True),)
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    name = Column(String, nullable=False, unique=True)
+    name = Column(String, nullable=False)
     body = Column(Text, nullable=False)
     args = Column(Text, nullable=False, default="{}")
     meta = Column(Text, nullable=False, default="{}")
+
+
+class Conversation(BaseModel):
+    """Model for storing chat sessions and their rolling summary."""
+
+    __tablename__ = "conversations"
+    __table_args__ = (
+        live_index("ix_conversations_live_session", "session", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    session = Column(String, nullable=False)
+    model = Column(String, nullable=True)
+    summary = Column(Text, nullable=True)
+    summary_upto = Column(Integer, nullable=False, default=0)
+
+
+class Message(BaseModel):
+    """Model for storing chat messages (append-only)."""
+
+    __tablename__ = "messages"
+    __table_args__ = (UniqueConstraint("conversation_id", "seq"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    conversation_id = Column(
+        Integer, ForeignKey("conversations.id", ondelete="CASCADE"), nullable=False
+    )
+    seq = Column(Integer, nullable=False)
+    role = Column(
+        Enum("system", "user", "assistant", name="message_roles"), nullable=False
+    )
+    content = Column(Text, nullable=False)
+    tokens = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,18 @@
+from ..utils.lazy import lazy_exports
+
+_EXPORTS = {
+    "AiClient": ".ollama",
+    "AiModel": ".ollama",
+    "AiResponse": ".ollama",
+    "ChatError": ".chat",
+    "ChatServer": ".chat",
+    "ChatService": ".chat",
+    "EmbeddingCache": ".embeddings",
+    "HistoryStore": ".history",
+    "MemoryStore": ".chat",
+    "RuleEngine": ".rules",
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__ = lazy_exports(__name__, _EXPORTS)
@@ -0,0 +1,342 @@
+import asyncio
+import json
+import logging
+import time
+import uuid
+from contextlib import aclosing
+from dataclasses import dataclass, field
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Optional,
+    Protocol,
+)
+
+from ..utils.metrics import metrics
+from .ollama import AiClient
+
+if TYPE_CHECKING:
+    from .embeddings import EmbeddingCache
+
+logger = logging.getLogger("chat_service")
+
+Message = dict[str, str]
+Retriever = Callable[[str], Awaitable[list[str]]]
+
+_END = object()  # end-of-stream marker for `ChatService.reply`
+
+CONTEXT_PROMPT = "Answer based on the provided context.\nContext:\n{context}"
+
+
+class ChatError(RuntimeError):
+    """Upstream generation failed; the turn is not persisted."""
+
+
+class ChatStore(Protocol):
+    """Persistence hook for conversation history."""
+
+    async def load(self, session_id: str) -> list[Message]: ...
+
+    async def append(self, session_id: str, messages: list[Message]) -> None: ...
+
+    async def forget(self, session_id: str) -> None:
+        """Release cached state for a session the service has evicted."""
+        ...
+
+
+class MemoryStore:
+    """Process-local store; history is lost on restart."""
+
+    def __init__(self):
+        self._history: dict[str, list[Message]] = {}
+
+    async def load(self, session_id: str) -> list[Message]:
+        return list(self._history.get(session_id, []))
+
+    async def append(self, session_id: str, messages: list[Message]) -> None:
+        self._history.setdefault(session_id, []).extend(messages)
+
+    async def forget(self, session_id: str) -> None:
+        pass  # the history itself lives here
+
+
+@dataclass
+class ChatSession:
+    id: str
+    messages: list[Message] = field(default_factory=list)
+    task: Optional[asyncio.Task] = None
+    last_seen: float = field(default_factory=time.monotonic)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+class ChatService:
+    """
+    Multi-session RAG chat on top of `AiClient.chat(stream=True)`.
+
+    A semaphore caps concurrent generations; starting a new turn in a session
+    cancels that session's previous, still-running generation.
+    """
+
+    def __init__(
+        self,
+        client: AiClient,
+        model: str,
+        store: Optional[ChatStore] = None,
+        retriever: Optional[Retriever] = None,
+        system_prompt: Optional[str] = None,
+        max_concurrency: int = 8,
+        session_ttl: float = 3600,
+    ):
+        self.client = client
+        self.model = model
+        self.store = store or MemoryStore()
+        self.retriever = retriever
+        self.system_prompt = system_prompt
+        self.session_ttl = session_ttl
+        self._limit = asyncio.Semaphore(max_concurrency)
+        self._sessions: dict[str, ChatSession] = {}
+
+    async def session(self, session_id: Optional[str] = None) -> ChatSession:
+        """Return an active session, restoring its history from the store."""
+        await self._evict_idle()
+        session_id = session_id or uuid.uuid4().hex
+        if session := self._sessions.get(session_id):
+            session.last_seen = time.monotonic()
+            return session
+        session = ChatSession(session_id, await self.store.load(session_id))
+        self._sessions[session_id] = session
+        return session
+
+    def cancel(self, session_id: str) -> bool:
+        """Cancel the in-flight generation of a session, if any."""
+        session = self._sessions.get(session_id)
+        if session and session.task and not session.task.done():
+            session.task.cancel()
+            return True
+        return False
+
+    async def _prompt(self, session: ChatSession, text: str) -> list[Message]:
+        system = [self.system_prompt] if self.system_prompt else []
+        if self.retriever:
+            with metrics.timer("chat_retrieval_seconds"):
+                documents = await self.retriever(text)
+            if documents:
+                context = "\n---\n".join(documents)
+                system.append(CONTEXT_PROMPT.format(context=context))
+        # The store decides what history to replay (e.g. a compacted summary).
+        session.messages = await self.store.load(session.id)
+        messages = [{"role": "system", "content": s} for s in system]
+        return messages + session.messages + [{"role": "user", "content": text}]
+
+    async def reply(self, session_id: str, text: str) -> AsyncGenerator[str, None]:
+        """
+        Stream the assistant reply to `text`.
+
+        The generation runs in its own task, so cancelling a turn (a newer
+        turn, `cancel()`, or the caller closing this generator early) never
+        touches the caller's task. The turn is persisted only when the
+        generation completes; failures raise `ChatError`.
+        """
+        session = await self.session(session_id)
+        self.cancel(session_id)
+        queue: asyncio.Queue = asyncio.Queue()
+        task = asyncio.create_task(self._generate(session, text, queue))
+        task.add_done_callback(lambda _: queue.put_nowait(_END))
+        session.task = task
+        try:
+            while (chunk := await queue.get()) is not _END:
+                yield chunk
+            if task.cancelled():
+                raise asyncio.CancelledError
+            task.result()
+        finally:
+            task.cancel()
+
+    async def _generate(
+        self, session: ChatSession, text: str, queue: asyncio.Queue
+    ) -> None:
+        async with session.lock, self._limit:
+            metrics.inc("chat_turns_total")
+            try:
+                messages = await self._prompt(session, text)
+                output: list[str] = []
+                stream = await self.client.chat(messages, self.model, stream=True)
+                async with aclosing(stream):
+                    async for chunk in stream:
+                        # AiClient reports upstream failures as an "Error: ..." chunk.
+                        if chunk.startswith("Error:"):
+                            raise ChatError(chunk.removeprefix("Error:").strip())
+                        output.append(chunk)
+                        queue.put_nowait(chunk)
+                turn = [
+                    {"role": "user", "content": text},
+                    {"role": "assistant", "content": "".join(output)},
+                ]
+                await self.store.append(session.id, turn)
+            except asyncio.CancelledError:
+                metrics.inc("chat_cancelled_total")
+                raise
+            except ChatError:
+                metrics.inc("chat_errors_total")
+                raise
+            except Exception as e:
+                # Retrieval and store failures surface the same way as upstream ones.
+                metrics.inc("chat_errors_total")
+                logger.exception("Chat turn failed for %s", session.id)
+                raise ChatError(str(e) or type(e).__name__) from e
+            finally:
+                if session.task is asyncio.current_task():
+                    session.task = None
+                session.last_seen = time.monotonic()
+
+    async def _evict_idle(self) -> None:
+        cutoff = time.monotonic() - self.session_ttl
+        for session_id, session in list(self._sessions.items()):
+            if session.last_seen < cutoff and session.task is None:
+                del self._sessions[session_id]
+                await self.store.forget(session_id)
+
+
+def chroma_retriever(
+    collection: Any,
+    client: AiClient,
+    model: str = "nomic-embed-text:latest",
+    n_results: int = 3,
+    cache: Optional["EmbeddingCache"] = None,
+) -> Retriever:
+    """Embed the query with Ollama (via `cache` when given) and search a Chroma collection off-loop."""
+
+    async def embed(query: str) -> Optional[Any]:
+        if cache is not None:
+            return await cache.embed(client, query, model)
+        async for vector in await client.embeddings(query, model):
+            if isinstance(vector, str):
+                raise RuntimeError(vector)
+            return vector
+        return None
+
+    async def retrieve(query: str) -> list[str]:
+        vector = await embed(query)
+        if vector is None:
+            return []
+        results = await asyncio.to_thread(
+            collection.query, query_embeddings=[vector], n_results=n_results
+        )
+        return results["documents"][0]
+
+    return retrieve
+
+
+class ChatServer:
+    """
+    Server-Sent Events front-end for `ChatService`.
+
+    POST   /sessions                 -> {"id": ...}
+    POST   /sessions/{id}/messages   -> text/event-stream of tokens
+    DELETE /sessions/{id}/messages   -> cancel the running generation
+    """
+
+    def __init__(self, service: ChatService, host: str = "127.0.0.1", port: int = 8000):
+        self.service = service
+        self.host = host
+        self.port = port
+
+    async def serve(self) -> None:
+        server = await asyncio.start_server(self._handle, self.host, self.port)
+        logger.info("Chat server listening on http://%s:%s", self.host, self.port)
+        async with server:
+            await server.serve_forever()
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            method, path, body = await self._read_request(reader)
+            parts = path.strip("/").split("/")
+            if method == "POST" and parts == ["sessions"]:
+                session = await self.service.session(body.get("id"))
+                await self._send_json(writer, 201, {"id": session.id})
+            elif parts[:1] == ["sessions"] and parts[2:] == ["messages"]:
+                if method == "POST":
+                    await self._stream(
+                        reader, writer, parts[1], body.get("content", "")
+                    )
+                elif method == "DELETE":
+                    cancelled = self.service.cancel(parts[1])
+                    await self._send_json(writer, 200, {"cancelled": cancelled})
+                else:
+                    await self._send_json(writer, 405, {"error": "method not allowed"})
+            else:
+                await self._send_json(writer, 404, {"error": "not found"})
+        except (ValueError, json.JSONDecodeError) as e:
+            await self._send_json(writer, 400, {"error": str(e)})
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _stream(self, reader, writer, session_id: str, text: str) -> None:
+        if not text:
+            raise ValueError("Message content is required.")
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/event-stream\r\n"
+            b"Cache-Control: no-cache\r\n"
+            b"Connection: close\r\n\r\n"
+        )
+
+        async def produce() -> None:
+            try:
+                async with aclosing(self.service.reply(session_id, text)) as tokens:
+                    async for token in tokens:
+                        event = json.dumps({"token": token})
+                        writer.write(f"data: {event}\n\n".encode())
+                        await writer.drain()
+            except ChatError as e:
+                event = json.dumps({"error": str(e)})
+                writer.write(f"event: error\ndata: {event}\n\n".encode())
+            except Exception as e:
+                logger.exception("Streaming failed for %s", session_id)
+                event = json.dumps({"error": str(e) or type(e).__name__})
+                writer.write(f"event: error\ndata: {event}\n\n".encode())
+            else:
+                writer.write(b"event: done\ndata: {}\n\n")
+            await writer.drain()
+
+        generation = asyncio.create_task(produce())
+        # The client sends nothing more; EOF means it went away.
+        hangup = asyncio.create_task(reader.read())
+        done, _ = await asyncio.wait(
+            {generation, hangup}, return_when=asyncio.FIRST_COMPLETED
+        )
+        if generation not in done:
+            generation.cancel()
+            logger.info("Client left; cancelled generation for %s", session_id)
+        hangup.cancel()
+        await asyncio.gather(generation, hangup, return_exceptions=True)
+
+    @staticmethod
+    async def _read_request(reader: asyncio.StreamReader) -> tuple[str, str, dict]:
+        line = await reader.readline()
+        method, path, _ = line.decode().split(" ", 2)
+        length = 0
+        while (header := await reader.readline()) not in (b"\r\n", b""):
+            name, _, value = header.decode().partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+        body = json.loads(await reader.readexactly(length)) if length else {}
+        return method, path, body
+
+    @staticmethod
+    async def _send_json(writer, status: int, data: dict) -> None:
+        payload = json.dumps(data).encode()
+        writer.write(
+            f"HTTP/1.1 {status} {'OK' if status < 400 else 'Error'}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            "Connection: close\r\n\r\n".encode() + payload
+        )
+        await writer.drain()
@@ -0,0 +1,59 @@
+import asyncio
+import hashlib
+import os
+from array import array
+from pathlib import Path
+from typing import Optional
+
+from ..utils.metrics import metrics
+from ..utils.vectors import Dtype, pack, unpack
+from .ollama import AiClient
+
+
+class EmbeddingCache:
+    """
+    Embeddings on disk, keyed by (model, text hash).
+
+    Vectors are stored with `utils.vectors.pack`, float16 by default, which
+    halves the size of float32. Pass "int8" to quarter it; the scale factor
+    is kept in each blob's header.
+    """
+
+    def __init__(
+        self, root: str | os.PathLike = ".cache/embeddings", dtype: Dtype = "float16"
+    ):
+        self.root = Path(root)
+        self.dtype = dtype
+
+    def _path(self, model: str, text: str) -> Path:
+        digest = hashlib.sha256(f"{model}\0{text}".encode()).hexdigest()
+        return self.root / digest[:2] / f"{digest}.vec"
+
+    def get(self, model: str, text: str) -> Optional[array]:
+        try:
+            blob = self._path(model, text).read_bytes()
+        except FileNotFoundError:
+            metrics.record_cache("embeddings", False)
+            return None
+        metrics.record_cache("embeddings", True)
+        return unpack(blob)
+
+    def put(self, model: str, text: str, vector: array) -> None:
+        path = self._path(model, text)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(pack(vector, self.dtype))
+        os.replace(tmp, path)
+
+    async def embed(
+        self, client: AiClient, text: str, model: str = "nomic-embed-text:latest"
+    ) -> array:
+        """Cached embedding for `text`; only misses reach Ollama."""
+        if (vector := await asyncio.to_thread(self.get, model, text)) is not None:
+            return vector
+        async for vector in await client.embeddings(text, model):
+            if isinstance(vector, str):
+                raise RuntimeError(vector)
+            await asyncio.to_thread(self.put, model, text, vector)
+            return vector
+        raise RuntimeError("Ollama returned no embedding")
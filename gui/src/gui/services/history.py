@@ -0,0 +1,229 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+
+from ..database.crud import CRUDAsync
+from ..database.models import Conversation, Message
+from ..utils.metrics import metrics
+from .ollama import AiClient
+
+logger = logging.getLogger("chat_history")
+
+ChatMessage = dict[str, str]
+
+SUMMARY_PROMPT = """Summarize the conversation below for your own future reference.
+Keep facts, names, decisions and open questions; drop pleasantries.
+
+{previous}{transcript}
+
+Summary:"""
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token, plus framing)."""
+    return len(text) // 4 + 4
+
+
+@dataclass
+class Thread:
+    """In-memory view of a conversation: rolling summary plus recent turns."""
+
+    conversation_id: int
+    summary: Optional[str] = None
+    summary_upto: int = 0  # messages with seq <= summary_upto are summarized
+    recent: list[ChatMessage] = field(default_factory=list)
+    next_seq: int = 1
+    compacting: Optional[asyncio.Task] = None
+
+    @property
+    def tokens(self) -> int:
+        return sum(estimate_tokens(m["content"]) for m in self.recent)
+
+    def context(self) -> list[ChatMessage]:
+        if not self.summary:
+            return list(self.recent)
+        note = f"Summary of the earlier conversation:\n{self.summary}"
+        return [{"role": "system", "content": note}, *self.recent]
+
+
+class HistoryStore:
+    """
+    Persistent `ChatStore` with batched, append-only writes.
+
+    Once the un-summarized part of a conversation exceeds `max_tokens`, older
+    turns are summarized in the background and only the summary plus the last
+    `keep_recent` messages are returned by `load`, so the prompt sent per turn
+    stays bounded however long the session runs.
+    """
+
+    def __init__(
+        self,
+        session: Any,
+        client: AiClient,
+        model: str,
+        max_tokens: int = 2048,
+        keep_recent: int = 6,
+        batch_size: int = 32,
+        flush_interval: float = 1.0,
+    ):
+        self.session = session
+        self.client = client
+        self.model = model
+        self.max_tokens = max_tokens
+        self.keep_recent = keep_recent
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.conversations = CRUDAsync(Conversation)
+        self.messages = CRUDAsync(Message)
+        self._threads: dict[str, Thread] = {}
+        self._loading: dict[str, asyncio.Task] = {}
+        self._pending: list[dict[str, Any]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    async def load(self, session_id: str) -> list[ChatMessage]:
+        return (await self._thread(session_id)).context()
+
+    async def append(self, session_id: str, messages: list[ChatMessage]) -> None:
+        thread = await self._thread(session_id)
+        for message in messages:
+            self._pending.append(
+                {
+                    "conversation_id": thread.conversation_id,
+                    "seq": thread.next_seq,
+                    "role": message["role"],
+                    "content": message["content"],
+                    "tokens": estimate_tokens(message["content"]),
+                }
+            )
+            thread.next_seq += 1
+        thread.recent.extend(messages)
+        if len(self._pending) >= self.batch_size:
+            await self.flush()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+        if thread.tokens > self.max_tokens and thread.compacting is None:
+            thread.compacting = asyncio.create_task(self._compact(thread))
+
+    async def flush(self) -> None:
+        """Write all buffered messages in a single transaction."""
+        async with self._lock:
+            batch, self._pending = self._pending, []
+            if not batch:
+                return
+            with metrics.timer("history_flush_seconds"):
+                async with self.session() as db:
+                    await self.messages.bulk_create(db, batch)
+            metrics.inc("history_messages_written_total", len(batch))
+
+    async def forget(self, session_id: str) -> None:
+        """Drop a session's cached thread once its summary and messages are written."""
+        thread = self._threads.get(session_id)
+        if thread is None:
+            return
+        if thread.compacting:
+            await asyncio.shield(thread.compacting)
+        await self.flush()
+        if self._threads.get(session_id) is thread:
+            del self._threads[session_id]
+
+    async def close(self) -> None:
+        tasks = [t.compacting for t in self._threads.values() if t.compacting]
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._flush_task:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self.flush()
+
+    async def _flush_later(self) -> None:
+        try:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+        finally:
+            self._flush_task = None
+
+    async def _thread(self, session_id: str) -> Thread:
+        if thread := self._threads.get(session_id):
+            metrics.record_cache("history_threads", True)
+            return thread
+        metrics.record_cache("history_threads", False)
+        # Concurrent first loads of one session share a single fetch-or-create.
+        task = self._loading.get(session_id)
+        if task is None:
+            task = asyncio.ensure_future(self._load_thread(session_id))
+            self._loading[session_id] = task
+            task.add_done_callback(lambda _: self._loading.pop(session_id, None))
+        return await asyncio.shield(task)
+
+    async def _conversation(self, db: Any, session_id: str) -> Conversation:
+        found = await self.conversations.filter_by(db, {"session": session_id})
+        if found:
+            return found[0]
+        try:
+            return await self.conversations.create(
+                db, {"session": session_id, "model": self.model}
+            )
+        except IntegrityError:
+            # Created by another process since the lookup.
+            await db.rollback()
+            found = await self.conversations.filter_by(db, {"session": session_id})
+            return found[0]
+
+    async def _load_thread(self, session_id: str) -> Thread:
+        async with self.session() as db:
+            conversation = await self._conversation(db, session_id)
+            rows = await db.scalars(
+                select(Message)
+                .where(
+                    Message.conversation_id == conversation.id,
+                    Message.seq > conversation.summary_upto,
+                )
+                .order_by(Message.seq)
+            )
+            recent = [{"role": m.role, "content": m.content} for m in rows]
+        thread = Thread(
+            conversation_id=conversation.id,
+            summary=conversation.summary,
+            summary_upto=conversation.summary_upto,
+            recent=recent,
+            next_seq=conversation.summary_upto + len(recent) + 1,
+        )
+        return self._threads.setdefault(session_id, thread)
+
+    async def _compact(self, thread: Thread) -> None:
+        try:
+            older = thread.recent[: -self.keep_recent or None]
+            if not older:
+                return
+            transcript = "\n".join(f"{m['role']}: {m['content']}" for m in older)
+            previous = (
+                f"Earlier summary:\n{thread.summary}\n\n" if thread.summary else ""
+            )
+            prompt = SUMMARY_PROMPT.format(previous=previous, transcript=transcript)
+            parts: list[str] = []
+            with metrics.timer("history_compaction_seconds"):
+                async for chunk in await self.client.generate(prompt, self.model):
+                    parts.append(chunk)
+            summary = "".join(parts)
+            if summary.startswith("Error:"):
+                raise RuntimeError(summary)
+            # Turns appended while summarizing stay in `recent`.
+            del thread.recent[: len(older)]
+            thread.summary = summary.strip()
+            thread.summary_upto += len(older)
+            await self.flush()
+            async with self.session() as db:
+                await self.conversations.update(
+                    db,
+                    thread.conversation_id,
+                    {"summary": thread.summary, "summary_upto": thread.summary_upto},
+                )
+            metrics.inc("history_compactions_total")
+        except Exception as e:  # keep serving the un-compacted history
+            logger.error(f"Compaction failed: {e}")
+        finally:
+            thread.compacting = None
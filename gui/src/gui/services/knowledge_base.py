@@ -0,0 +1,200 @@
+"""
+Knowledge-base maintenance for `.ai_knowledge_base/` (the `#cleanup` command).
+
+Keeps the latest note per folder plus any note marked `retain: true` or
+tagged `#pin`; everything else is moved into `.trash/<date>/` with atomic
+renames and listed in a `retrospectives/cleanup_<date>.md` summary.
+
+    python -m gui.services.knowledge_base --root .ai_knowledge_base --dry-run
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from ..utils.time import Date
+
+INDEX_FILE = ".index.json"
+TRASH_DIR = ".trash"
+PROTECTED_DIRS = {"retrospectives"}
+PROTECTED_FILES = {"README.md"}
+RETAIN = re.compile(rb"retain:\s*true|#pin")
+SUMMARY_DELETED = re.compile(r"^  - (.+)$", re.MULTILINE)
+
+
+@dataclass
+class Note:
+    path: str  # relative to the knowledge-base root, "/" separated
+    mtime_ns: int
+    size: int
+    retain: bool
+
+    @property
+    def folder(self) -> str:
+        return self.path.rpartition("/")[0]
+
+
+@dataclass
+class CleanupPlan:
+    keep: list[str] = field(default_factory=list)
+    delete: list[str] = field(default_factory=list)
+    scanned: int = 0
+    read: int = 0  # files whose content had to be (re)read
+
+
+class KnowledgeBase:
+    """Single-pass scanner with a persistent metadata index."""
+
+    def __init__(self, root: str | os.PathLike = ".ai_knowledge_base"):
+        self.root = Path(root)
+        self.index_path = self.root / INDEX_FILE
+
+    def _load_index(self) -> dict[str, list]:
+        try:
+            data = json.loads(self.index_path.read_text(encoding="utf-8"))
+            return data.get("files", {})
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _save_index(self, notes: list[Note]) -> None:
+        files = {n.path: [n.mtime_ns, n.size, n.retain] for n in notes}
+        _write_atomic(self.index_path, json.dumps({"version": 1, "files": files}))
+
+    @staticmethod
+    def _is_retained(path: str) -> bool:
+        with open(path, "rb") as f:
+            return bool(RETAIN.search(f.read()))
+
+    def scan(self) -> tuple[list[Note], int]:
+        """Walk the tree once; only new or modified notes are read."""
+        index = self._load_index()
+        notes: list[Note] = []
+        read = 0
+        stack = [(str(self.root), "")]
+        while stack:
+            directory, prefix = stack.pop()
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name.startswith("."):
+                        continue
+                    rel = f"{prefix}{entry.name}"
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append((entry.path, f"{rel}/"))
+                    elif entry.name.endswith(".md") and entry.is_file():
+                        stat = entry.stat()
+                        cached = index.get(rel)
+                        if cached and cached[:2] == [stat.st_mtime_ns, stat.st_size]:
+                            retain = cached[2]
+                        else:
+                            retain = self._is_retained(entry.path)
+                            read += 1
+                        notes.append(Note(rel, stat.st_mtime_ns, stat.st_size, retain))
+        return notes, read
+
+    @staticmethod
+    def _eligible(note: Note) -> bool:
+        folder = note.folder
+        if not folder or note.path.rsplit("/", 1)[-1] in PROTECTED_FILES:
+            return False
+        return folder.split("/", 1)[0] not in PROTECTED_DIRS
+
+    def plan(self, notes: Optional[list[Note]] = None) -> CleanupPlan:
+        plan = CleanupPlan()
+        if notes is None:
+            notes, plan.read = self.scan()
+        plan.scanned = len(notes)
+        latest: dict[str, Note] = {}
+        candidates = [n for n in notes if self._eligible(n)]
+        for note in candidates:
+            if note.retain:
+                continue
+            current = latest.get(note.folder)
+            if current is None or note.mtime_ns > current.mtime_ns:
+                latest[note.folder] = note
+        for note in candidates:
+            if note.retain or latest.get(note.folder) is note:
+                plan.keep.append(note.path)
+            else:
+                plan.delete.append(note.path)
+        plan.keep.sort()
+        plan.delete.sort()
+        return plan
+
+    def cleanup(self, dry_run: bool = False, purge: bool = False) -> CleanupPlan:
+        notes, read = self.scan()
+        plan = self.plan(notes)
+        plan.read = read
+        if dry_run:
+            return plan
+        today = Date.date().isoformat()
+        trash = self.root / TRASH_DIR / today
+        for rel in plan.delete:
+            target = trash / rel
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(self.root / rel, target)
+        removed = set(plan.delete)
+        self._save_index([n for n in notes if n.path not in removed])
+        self._write_summary(plan, today)
+        if purge:
+            shutil.rmtree(self.root / TRASH_DIR, ignore_errors=True)
+        return plan
+
+    def _write_summary(self, plan: CleanupPlan, today: str) -> Path:
+        """Write (or merge into) today's summary; earlier runs' deletions are kept."""
+        name = f"cleanup_{today}.md"
+        path = self.root / "retrospectives" / name
+        try:
+            previous = SUMMARY_DELETED.findall(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            previous = []
+        removed = list(dict.fromkeys(previous + plan.delete))
+        deleted = "\n".join(f"  - {rel}" for rel in removed) or "  []"
+        body = (
+            f"# Cleanup Summary – {today}\n\n"
+            f"Kept {len(plan.keep)} notes, removed {len(removed)}.\n\n"
+            "<!--\n@cleanup-summary\n"
+            f"deleted:\n{deleted}\n"
+            f"merged_into: {name}\n-->\n"
+        )
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _write_atomic(path, body)
+        return path
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Clean up .ai_knowledge_base/.")
+    parser.add_argument("--root", default=".ai_knowledge_base")
+    parser.add_argument(
+        "--dry-run", action="store_true", help="show what would be removed"
+    )
+    parser.add_argument(
+        "--purge", action="store_true", help="empty .trash/ after moving files"
+    )
+    args = parser.parse_args(argv)
+
+    if not Path(args.root).is_dir():
+        parser.error(f"Knowledge base not found: {args.root}")
+    plan = KnowledgeBase(args.root).cleanup(dry_run=args.dry_run, purge=args.purge)
+    verb = "Would remove" if args.dry_run else "Removed"
+    for rel in plan.delete:
+        print(f"{verb}: {rel}")
+    print(
+        f"Scanned {plan.scanned} notes ({plan.read} read), "
+        f"kept {len(plan.keep)}, {verb.lower()} {len(plan.delete)}."
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,19 +1,23 @@
 import asyncio
 import json
 import logging
+import time
+import weakref
+from array import array
 from collections.abc import Callable
 from contextlib import asynccontextmanager
 from dataclasses import dataclass
 from types import SimpleNamespace as Obj
-from typing import Any, AsyncGenerator, Optional
-
-import httpx
+from typing import TYPE_CHECKING, Any, AsyncGenerator, Optional
 
+from ..utils.metrics import metrics
+from ..utils.portal import portal
 from ..utils.time import to_seconds
+from ..utils.vectors import to_float32
+
+if TYPE_CHECKING:
+    import httpx
 
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
 logger = logging.getLogger("ollama_client")
 
 
@@ -41,7 +45,22 @@ class AiClient:
     ):
         self.base_url = base_url
         self.timeout = timeout
-        self._client = httpx.AsyncClient(timeout=timeout)
+        # One pool per event loop: an httpx pool is bound to the loop that
+        # first used it, and `run_sync` calls run on the portal loop.
+        self._pools: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, "httpx.AsyncClient"
+        ] = weakref.WeakKeyDictionary()
+
+    @property
+    def _client(self) -> "httpx.AsyncClient":
+        """HTTP client for the running loop, created on its first request."""
+        loop = asyncio.get_running_loop()
+        http = self._pools.get(loop)
+        if http is None or http.is_closed:
+            import httpx  # deferred: keeps `import gui.services` cheap
+
+            http = self._pools[loop] = httpx.AsyncClient(timeout=self.timeout)
+        return http
 
     @asynccontextmanager
     async def client(
@@ -54,13 +73,38 @@ class AiClient:
             await client.close()
 
     def run_sync(self, func_name: str, *args, **kwargs) -> Any:
+        """
+        Call an async method from sync code on the shared portal loop.
+
+        These calls share a pool that lives on the portal loop, separate from
+        any pool used by async callers; async generators are drained into a
+        list.
+        """
         method = getattr(self, func_name, None)
         if not callable(method):
             raise ValueError(f"Method {func_name} not found")
-        return asyncio.run(method(*args, **kwargs))
+
+        async def call() -> Any:
+            result = method(*args, **kwargs)
+            if not hasattr(result, "__aiter__"):
+                result = await result
+            if hasattr(result, "__aiter__"):
+                return [item async for item in result]
+            return result
+
+        return portal.call(call)
 
     async def close(self) -> None:
-        await self._client.aclose()
+        """Close the pools of every loop, including the `run_sync` portal's."""
+        loop = asyncio.get_running_loop()
+        for owner, http in list(self._pools.items()):
+            if owner is loop:
+                await http.aclose()
+            elif owner.is_running():
+                # Another thread's loop (the portal): close it over there.
+                future = asyncio.run_coroutine_threadsafe(http.aclose(), owner)
+                await asyncio.wrap_future(future)
+            del self._pools[owner]
         logger.debug("HTTP client closed")
 
     async def _handle_request(
@@ -70,25 +114,35 @@ class AiClient:
         headers: Optional[dict] = None,
         **kwargs,
     ) -> Any:
+        import httpx
+
         headers = headers or {"Content-Type": "application/json"}
         url = f"{self.base_url}{endpoint}"
         try:
-            response = await self._client.request(
-                method, url, headers=headers, **kwargs
-            )
-            response.raise_for_status()
-            return response.json()
+            with (
+                metrics.span("ollama.request", endpoint=endpoint, method=method),
+                metrics.timer("ollama_request_seconds", endpoint=endpoint),
+            ):
+                response = await self._client.request(
+                    method, url, headers=headers, **kwargs
+                )
+                response.raise_for_status()
+                return response.json()
         except httpx.RequestError as e:
+            metrics.inc("ollama_errors_total", endpoint=endpoint, kind="request")
             logger.error(f"Request error at {url}: {e}")
             raise RuntimeError(f"Request error: {e}") from e
         except Exception as e:
+            metrics.inc("ollama_errors_total", endpoint=endpoint, kind="unexpected")
             logger.error(f"Unexpected error at {url}: {e}")
             raise RuntimeError(f"Unexpected error: {e}") from e
 
     async def _stream_response(
         self, endpoint: str, payload: dict[str, Any], embedding: bool = False
-    ) -> AsyncGenerator[str, None]:
+    ) -> AsyncGenerator[str | array, None]:
         url = f"{self.base_url}{endpoint}"
+        started = time.perf_counter()
+        first_token = True
         try:
             async with self._client.stream("POST", url, json=payload) as response:
                 response.raise_for_status()
@@ -96,8 +150,17 @@ class AiClient:
                     if line := line.strip():
                         try:
                             data = json.loads(line)
+                            if first_token:
+                                first_token = False
+                                metrics.observe(
+                                    "ollama_ttft_seconds",
+                                    time.perf_counter() - started,
+                                    endpoint=endpoint,
+                                )
+                            if data.get("done"):
+                                self._record_eval(endpoint, data)
                             if embedding:
-                                yield data.get("embedding", "")
+                                yield to_float32(data.get("embedding", ()))
                             else:
                                 yield data.get(
                                     "response",
@@ -106,23 +169,43 @@ class AiClient:
                         except json.JSONDecodeError:
                             logger.warning(f"Malformed JSON: {line}")
         except Exception as e:
+            metrics.inc("ollama_errors_total", endpoint=endpoint, kind="stream")
             logger.error(f"Streaming error: {e}")
             yield f"Error: {e}"
+        finally:
+            metrics.observe(
+                "ollama_stream_seconds",
+                time.perf_counter() - started,
+                endpoint=endpoint,
+            )
+
+    @staticmethod
+    def _record_eval(endpoint: str, data: dict[str, Any]) -> None:
+        """Record generation throughput from Ollama's final frame."""
+        count = data.get("eval_count")
+        duration = data.get("eval_duration")  # nanoseconds
+        if count and duration:
+            metrics.observe(
+                "ollama_tokens_per_second", count / (duration / 1e9), endpoint=endpoint
+            )
+            metrics.inc("ollama_tokens_total", count, endpoint=endpoint)
 
     async def _request_or_stream(
         self,
         endpoint: str,
         payload: dict[str, Any],
         stream: bool,
-        extract: Callable[[dict], str],
+        extract: Callable[[dict], str | array],
         embedding: bool = False,
-    ) -> AsyncGenerator[str, None] | str:
+    ) -> AsyncGenerator[str | array, None]:
         if stream:
             async for chunk in self._stream_response(endpoint, payload, embedding):
                 yield chunk
         else:
             try:
                 data = await self._handle_request("POST", endpoint, json=payload)
+                if data.get("done"):
+                    self._record_eval(endpoint, data)
                 yield extract(data)
             except Exception as e:
                 yield f"Error: {e}"
@@ -168,13 +251,14 @@ class AiClient:
 
     async def embeddings(
         self, prompt: str, model: str = "nomic-embed-text:latest", stream: bool = False
-    ) -> AsyncGenerator[str, None]:
+    ) -> AsyncGenerator[str | array, None]:
+        """Yield the prompt embedding as a float32 `array` (4 bytes per value)."""
         payload = {"model": model, "prompt": prompt, "stream": stream}
         return self._request_or_stream(
             "/api/embeddings",
             payload,
             stream,
-            extract=lambda d: d.get("embedding", ""),
+            extract=lambda d: to_float32(d.get("embedding", ())),
             embedding=True,
         )
 
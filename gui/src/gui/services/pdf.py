@@ -0,0 +1,221 @@
+import asyncio
+import concurrent.futures
+import hashlib
+import multiprocessing
+import os
+import textwrap
+from pathlib import Path
+from typing import AsyncGenerator, Iterator, Literal, Optional
+
+from ..utils.metrics import metrics
+
+# "fast": PyMuPDF's plain text in content-stream order, no sorting.
+# "layout": words placed on a fixed-width grid by position (slower).
+Mode = Literal["fast", "layout"]
+Page = tuple[int, str]
+
+
+def file_hash(path: str | os.PathLike) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(1 << 20):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _layout_text(page) -> str:
+    """
+    Rebuild the page as a fixed-width text grid from word positions.
+
+    Words on the same visual row are joined with spaces padded to their
+    horizontal offset, and vertical gaps become blank lines, so columns and
+    tables keep their alignment.
+    """
+    words = page.get_text("words", sort=True)  # x0, y0, x1, y1, word, ...
+    if not words:
+        return ""
+    chars = sum(len(w[4]) for w in words)
+    char_width = sum(w[2] - w[0] for w in words) / chars
+    rows: list[list] = []
+    for word in sorted(words, key=lambda w: (w[3], w[0])):
+        if rows and abs(rows[-1][0][3] - word[3]) <= (word[3] - word[1]) / 2:
+            rows[-1].append(word)
+        else:
+            rows.append([word])
+    lines: list[str] = []
+    previous = None
+    for row in rows:
+        height = row[0][3] - row[0][1]
+        if previous is not None and height > 0:
+            gap = round((row[0][3] - previous) / height) - 1
+            lines.extend([""] * max(0, min(gap, 2)))
+        previous = row[0][3]
+        line = ""
+        for x0, _, _, _, text, *_ in sorted(row, key=lambda w: w[0]):
+            column = round(x0 / char_width)
+            line += " " * max(column - len(line), 1 if line else 0) + text
+        lines.append(line)
+    return textwrap.dedent("\n".join(lines)) + "\n"
+
+
+def _extract_range(path: str, start: int, stop: int, mode: Mode) -> list[Page]:
+    """Worker: extract pages `[start, stop)` of one document (no OCR)."""
+    import pymupdf  # imported in the worker process only
+
+    with pymupdf.open(path) as doc:
+        if mode == "layout":
+            return [(n, _layout_text(doc[n])) for n in range(start, stop)]
+        return [(n, doc[n].get_text("text")) for n in range(start, stop)]
+
+
+class PageCache:
+    """Extracted text on disk, keyed by (file hash, mode, page)."""
+
+    def __init__(self, root: str | os.PathLike):
+        self.root = Path(root)
+
+    def _path(self, digest: str, mode: Mode, page: int) -> Path:
+        return self.root / digest[:2] / digest / f"{mode}-{page}.txt"
+
+    def get(self, digest: str, mode: Mode, page: int) -> Optional[str]:
+        try:
+            text = self._path(digest, mode, page).read_text(encoding="utf-8")
+        except FileNotFoundError:
+            metrics.record_cache("pdf_pages", False)
+            return None
+        metrics.record_cache("pdf_pages", True)
+        return text
+
+    def put(self, digest: str, mode: Mode, page: int, text: str) -> None:
+        path = self._path(digest, mode, page)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(text, encoding="utf-8")
+        os.replace(tmp, path)
+
+
+class PdfExtractor:
+    """
+    Parallel PDF text extraction with a per-page cache.
+
+    Uncached pages are split into ranges of `pages_per_task` and extracted on
+    a process pool; pages are yielded as soon as their range completes, so
+    callers should not rely on page order.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | os.PathLike = ".cache/pdf",
+        workers: Optional[int] = None,
+        pages_per_task: int = 8,
+    ):
+        self.cache = PageCache(cache_dir)
+        self.workers = workers or os.cpu_count() or 1
+        self.pages_per_task = pages_per_task
+        self._pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+        self._hashes: dict[str, tuple[int, int, str]] = {}
+
+    @property
+    def pool(self) -> concurrent.futures.ProcessPoolExecutor:
+        if self._pool is None:
+            # Never fork: the process may already run threads (portal loop,
+            # metrics server), and forking those can deadlock.
+            methods = multiprocessing.get_all_start_methods()
+            method = "forkserver" if "forkserver" in methods else "spawn"
+            self._pool = concurrent.futures.ProcessPoolExecutor(
+                self.workers, mp_context=multiprocessing.get_context(method)
+            )
+        return self._pool
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def __enter__(self) -> "PdfExtractor":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _digest(self, path: str) -> str:
+        stat = os.stat(path)
+        known = self._hashes.get(path)
+        if known and known[:2] == (stat.st_mtime_ns, stat.st_size):
+            return known[2]
+        digest = file_hash(path)
+        self._hashes[path] = (stat.st_mtime_ns, stat.st_size, digest)
+        return digest
+
+    @staticmethod
+    def page_count(path: str) -> int:
+        import pymupdf
+
+        with pymupdf.open(path) as doc:
+            return doc.page_count
+
+    def _plan(
+        self, path: str, mode: Mode
+    ) -> tuple[str, list[Page], list[tuple[int, int]]]:
+        """Split a document into cached pages and ranges still to extract."""
+        digest = self._digest(path)
+        cached: list[Page] = []
+        missing: list[int] = []
+        for number in range(self.page_count(path)):
+            text = self.cache.get(digest, mode, number)
+            if text is None:
+                missing.append(number)
+            else:
+                cached.append((number, text))
+        ranges: list[tuple[int, int]] = []
+        for number in missing:
+            if ranges and ranges[-1][1] == number:
+                start, stop = ranges[-1]
+                if stop - start < self.pages_per_task:
+                    ranges[-1] = (start, number + 1)
+                    continue
+            ranges.append((number, number + 1))
+        return digest, cached, ranges
+
+    def _store(self, digest: str, mode: Mode, pages: list[Page]) -> list[Page]:
+        for number, text in pages:
+            self.cache.put(digest, mode, number, text)
+        metrics.inc("pdf_pages_extracted_total", len(pages), mode=mode)
+        return pages
+
+    def iter_pages(
+        self, path: str | os.PathLike, mode: Mode = "fast"
+    ) -> Iterator[Page]:
+        """Yield `(page_number, text)` pairs as they become available."""
+        path = os.fspath(path)
+        digest, cached, ranges = self._plan(path, mode)
+        yield from cached
+        futures = [
+            self.pool.submit(_extract_range, path, start, stop, mode)
+            for start, stop in ranges
+        ]
+        for future in concurrent.futures.as_completed(futures):
+            yield from self._store(digest, mode, future.result())
+
+    async def pages(
+        self, path: str | os.PathLike, mode: Mode = "fast"
+    ) -> AsyncGenerator[Page, None]:
+        """Async variant of `iter_pages`; hashing and planning run off-loop."""
+        path = os.fspath(path)
+        loop = asyncio.get_running_loop()
+        digest, cached, ranges = await asyncio.to_thread(self._plan, path, mode)
+        for page in cached:
+            yield page
+        futures = [
+            loop.run_in_executor(self.pool, _extract_range, path, start, stop, mode)
+            for start, stop in ranges
+        ]
+        for future in asyncio.as_completed(futures):
+            for page in self._store(digest, mode, await future):
+                yield page
+
+    def extract(self, path: str | os.PathLike, mode: Mode = "fast") -> str:
+        """Whole-document text in page order."""
+        with metrics.timer("pdf_extract_seconds", mode=mode):
+            pages = sorted(self.iter_pages(path, mode))
+        return "\n".join(text for _, text in pages)
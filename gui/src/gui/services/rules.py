@@ -0,0 +1,356 @@
+"""
+Cursor `.mdc` rules: parse once, index globs, answer "rules for path" fast.
+
+Rule types follow Cursor: `alwaysApply: true` -> "always", globs -> "auto"
+(attached when a path matches), a description only -> "agent" (offered to
+the model), nothing -> "manual".
+"""
+
+import asyncio
+import functools
+import hashlib
+import json
+import logging
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from ..utils.metrics import metrics
+from ..utils.time import Date
+
+logger = logging.getLogger("rules")
+
+SUFFIX_GLOB = re.compile(r"^(?:\*\*/)?\*(\.[^/*?\[\]{}]+)$")
+BRACES = re.compile(r"\{([^{}]*)\}")
+GLOB_SEPARATOR = re.compile(r",(?![^{]*\})")
+
+
+@dataclass(frozen=True)
+class RuleFile:
+    name: str  # path relative to the rules root, without `.mdc`
+    type: str
+    description: str
+    globs: tuple[str, ...]
+    body: str
+    checksum: str
+
+    def to_row(self) -> dict[str, Any]:
+        """Column values for `models.Rule`."""
+        return {
+            "name": self.name,
+            "type": self.type,
+            "description": self.description or None,
+            "globs": json.dumps(list(self.globs)),
+            "checksum": self.checksum,
+            "content": self.body,
+        }
+
+
+def parse_frontmatter(text: str) -> tuple[dict[str, Any], str]:
+    """
+    Split `---` frontmatter from the body.
+
+    Cursor writes loose YAML (`globs: *.ts, *.tsx` unquoted), so values are
+    read line by line instead of through a YAML parser.
+    """
+    if not text.startswith("---"):
+        return {}, text
+    end = text.find("\n---", 3)
+    if end == -1:
+        return {}, text
+    meta: dict[str, Any] = {}
+    for line in text[3:end].splitlines():
+        key, sep, value = line.partition(":")
+        if not sep or not key.strip():
+            continue
+        value = value.strip()
+        if value.lower() in ("true", "false"):
+            meta[key.strip()] = value.lower() == "true"
+        else:
+            meta[key.strip()] = value.strip("\"'")
+    body = text[end + 4 :]
+    return meta, body.lstrip("\r\n")
+
+
+def split_globs(value: Any) -> tuple[str, ...]:
+    """`*.py, src/**/*.{ts,tsx}` or `["*.py"]` -> tuple of globs (commas inside braces kept)."""
+    if not value or value is True:
+        return ()
+    value = str(value).strip().strip("[]")
+    globs = (part.strip().strip("\"'") for part in GLOB_SEPARATOR.split(value))
+    return tuple(glob for glob in globs if glob)
+
+
+def parse_rule(name: str, data: bytes) -> RuleFile:
+    meta, body = parse_frontmatter(data.decode("utf-8", errors="replace"))
+    globs = split_globs(meta.get("globs"))
+    description = meta.get("description") or ""
+    if not isinstance(description, str):
+        description = ""
+    if meta.get("alwaysApply") is True:
+        kind = "always"
+    elif globs:
+        kind = "auto"
+    elif description:
+        kind = "agent"
+    else:
+        kind = "manual"
+    checksum = hashlib.sha256(data).hexdigest()
+    return RuleFile(name, kind, description, globs, body, checksum)
+
+
+def expand_braces(glob: str) -> list[str]:
+    """`src/*.{ts,tsx}` -> `["src/*.ts", "src/*.tsx"]`."""
+    match = BRACES.search(glob)
+    if match is None:
+        return [glob]
+    head, tail = glob[: match.start()], glob[match.end() :]
+    return [
+        expanded
+        for option in match.group(1).split(",")
+        for expanded in expand_braces(f"{head}{option}{tail}")
+    ]
+
+
+def glob_to_regex(glob: str) -> str:
+    """
+    Translate one gitignore-style glob.
+
+    Globs without a `/` match at any depth, `**` crosses directories and a
+    glob naming a directory also matches everything below it.
+    """
+    glob = glob.removeprefix("./")
+    anchored = "/" in glob.rstrip("/")
+    glob = glob.strip("/")
+    out: list[str] = []
+    i = 0
+    while i < len(glob):
+        if glob.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif glob.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif glob[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif glob[i] == "?":
+            out.append("[^/]")
+            i += 1
+        elif glob[i] == "[" and (close := glob.find("]", i + 1)) != -1:
+            out.append(glob[i : close + 1].replace("[!", "[^", 1))
+            i = close + 1
+        else:
+            out.append(re.escape(glob[i]))
+            i += 1
+    prefix = "" if anchored else "(?:.*/)?"
+    return f"{prefix}{''.join(out)}(?:/.*)?"
+
+
+@functools.lru_cache(maxsize=8192)
+def compile_pattern(pattern: str) -> re.Pattern:
+    """Compiled patterns survive index rebuilds, so a re-index only compiles what changed."""
+    return re.compile(pattern)
+
+
+class GlobIndex:
+    """
+    All `auto` rule globs compiled into one matcher.
+
+    Plain suffix globs (`*.py`, `**/*.test.ts`) go into a suffix table probed
+    once per dot in the file name. Other globs are bucketed by their leading
+    literal directories (`src/api/**/*.py` under "src/api"), a path walks its
+    own directory prefixes through that table, and each bucket is folded into
+    a single alternation used as a prefilter, so a lookup only tries the
+    patterns that can possibly match.
+    """
+
+    def __init__(self, rules: Iterable[RuleFile]):
+        self.suffixes: dict[str, set[str]] = {}
+        buckets: dict[str, list[tuple[re.Pattern, str]]] = {}
+        for rule in rules:
+            for glob in rule.globs:
+                for expanded in expand_braces(glob):
+                    self._add(buckets, expanded, rule.name)
+        self.buckets = {
+            head: (self._combine(patterns), patterns)
+            for head, patterns in buckets.items()
+        }
+
+    @staticmethod
+    def _combine(patterns: list[tuple[re.Pattern, str]]) -> re.Pattern:
+        return compile_pattern("|".join(f"(?:{p.pattern})" for p, _ in patterns))
+
+    def _add(
+        self, buckets: dict[str, list[tuple[re.Pattern, str]]], glob: str, name: str
+    ) -> None:
+        suffix = SUFFIX_GLOB.match(glob)
+        if suffix:
+            self.suffixes.setdefault(suffix.group(1), set()).add(name)
+            return
+        pattern = compile_pattern(glob_to_regex(glob))
+        segments = glob.removeprefix("./").strip("/").split("/")
+        literal: list[str] = []
+        for segment in segments[:-1]:
+            if any(c in segment for c in "*?["):
+                break
+            literal.append(segment)
+        buckets.setdefault("/".join(literal), []).append((pattern, name))
+
+    def match(self, path: str) -> set[str]:
+        names: set[str] = set()
+        base = path.rpartition("/")[2]
+        dot = base.find(".")
+        while dot != -1:
+            names.update(self.suffixes.get(base[dot:], ()))
+            dot = base.find(".", dot + 1)
+        head = ""
+        for segment in path.split("/"):
+            bucket = self.buckets.get(head)
+            if bucket is not None and bucket[0].fullmatch(path):
+                names.update(n for p, n in bucket[1] if p.fullmatch(path))
+            head = f"{head}/{segment}" if head else segment
+        return names
+
+
+class RuleEngine:
+    """
+    Rules loaded from a directory of `.mdc` files.
+
+    `refresh()` stats every file and re-parses only new or modified ones; the
+    glob index and the per-path cache are rebuilt only when something changed.
+    """
+
+    def __init__(self, root: str | os.PathLike = "rules", cache_size: int = 4096):
+        self.root = Path(root)
+        self.cache_size = cache_size
+        self.rules: dict[str, RuleFile] = {}
+        self._stats: dict[str, tuple[int, int]] = {}
+        self._always: list[RuleFile] = []
+        self._index = GlobIndex(())
+        self._cache: dict[str, list[RuleFile]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def _scan(self) -> dict[str, tuple[str, int, int]]:
+        found: dict[str, tuple[str, int, int]] = {}
+        stack = [(str(self.root), "")]
+        while stack:
+            directory, prefix = stack.pop()
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name.startswith("."):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append((entry.path, f"{prefix}{entry.name}/"))
+                    elif entry.name.endswith(".mdc") and entry.is_file():
+                        stat = entry.stat()
+                        name = f"{prefix}{entry.name[:-4]}"
+                        found[name] = (entry.path, stat.st_mtime_ns, stat.st_size)
+        return found
+
+    def refresh(self) -> list[str]:
+        """Re-index changed rules; returns the names that were added, changed or removed."""
+        found = self._scan()
+        changed = [name for name in self.rules if name not in found]
+        for name in changed:
+            del self.rules[name]
+            del self._stats[name]
+        for name, (path, mtime_ns, size) in found.items():
+            if self._stats.get(name) == (mtime_ns, size):
+                continue
+            with open(path, "rb") as f:
+                rule = parse_rule(name, f.read())
+            self._stats[name] = (mtime_ns, size)
+            current = self.rules.get(name)
+            if current is None or current.checksum != rule.checksum:
+                self.rules[name] = rule
+                changed.append(name)
+        if changed:
+            self._rebuild()
+            metrics.inc("rules_reindexed_total", len(changed))
+        return sorted(changed)
+
+    def _rebuild(self) -> None:
+        ordered = sorted(self.rules.values(), key=lambda rule: rule.name)
+        self._always = [rule for rule in ordered if rule.type == "always"]
+        self._index = GlobIndex(rule for rule in ordered if rule.type == "auto")
+        self._cache = {}
+
+    def get(self, name: str) -> Optional[RuleFile]:
+        return self.rules.get(name)
+
+    def requested(self) -> list[RuleFile]:
+        """`agent` rules: the model picks these by description."""
+        return sorted(
+            (rule for rule in self.rules.values() if rule.type == "agent"),
+            key=lambda rule: rule.name,
+        )
+
+    def for_path(self, path: str | os.PathLike) -> list[RuleFile]:
+        """`always` rules plus every `auto` rule whose globs match `path`."""
+        key = os.fspath(path).replace(os.sep, "/").removeprefix("./")
+        cached = self._cache.get(key)
+        if cached is not None:
+            metrics.record_cache("rules", True)
+            return cached
+        metrics.record_cache("rules", False)
+        names = self._index.match(key)
+        result = self._always + [self.rules[name] for name in sorted(names)]
+        if len(self._cache) >= self.cache_size:
+            self._cache.clear()
+        self._cache[key] = result
+        return result
+
+    async def watch(self, interval: float = 2.0) -> None:
+        """Poll the rules directory and re-index on change."""
+        while True:
+            try:
+                changed = await asyncio.to_thread(self.refresh)
+                if changed:
+                    logger.info(f"Rules re-indexed: {changed}")
+            except Exception as e:
+                logger.error(f"Rules refresh failed: {e}")
+            await asyncio.sleep(interval)
+
+    def start(self, interval: float = 2.0) -> asyncio.Task:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.watch(interval))
+        return self._task
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def sync(self, db: Any) -> dict[str, int]:
+        """
+        Mirror the loaded rules into `models.Rule`, keyed by name.
+
+        Rows are written only when the file checksum differs; rules whose file
+        is gone are soft-deleted.
+        """
+        from ..database.crud import CRUDAsync
+        from ..database.models import Rule
+
+        crud = CRUDAsync(Rule)
+        stmt = crud.statement_select(include_deleted=True).where(Rule.name.is_not(None))
+        rows = {row.name: row for row in (await db.scalars(stmt)).all()}
+        counts = {"created": 0, "updated": 0, "deleted": 0}
+        for name, rule in self.rules.items():
+            row = rows.get(name)
+            if row is None:
+                db.add(crud.create_instance(rule.to_row()))
+                counts["created"] += 1
+            elif row.checksum != rule.checksum or row.deleted_at is not None:
+                crud.update_instance(row, {**rule.to_row(), "deleted_at": None})
+                counts["updated"] += 1
+        for name, row in rows.items():
+            if name not in self.rules and row.deleted_at is None:
+                row.deleted_at = Date.datetime()
+                counts["deleted"] += 1
+        if any(counts.values()):
+            await db.commit()
+        return counts
@@ -0,0 +1,16 @@
+from .lazy import lazy_exports
+
+_EXPORTS = {
+    "Date": ".time",
+    "to_seconds": ".time",
+    "Metrics": ".metrics",
+    "Portal": ".portal",
+    "as_numpy": ".vectors",
+    "pack": ".vectors",
+    "to_float32": ".vectors",
+    "unpack": ".vectors",
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__ = lazy_exports(__name__, _EXPORTS)
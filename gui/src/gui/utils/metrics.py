@@ -0,0 +1,243 @@
+import json
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from typing import Any, Iterator, Optional
+
+Labels = tuple[tuple[str, str], ...]
+
+DEFAULT_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+RATE_BUCKETS = (1, 5, 10, 20, 40, 60, 80, 100, 150, 200, 400, 800)
+
+
+def _labels(labels: dict[str, Any]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(labels: Labels, extra: Optional[tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    body = ",".join(f'{k}="{v}"' for k, v in pairs)
+    return "{" + body + "}"
+
+
+class Histogram:
+    """Cumulative histogram with fixed upper bounds (Prometheus semantics)."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        total = 0
+        rows = []
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            rows.append(("+Inf" if bound == float("inf") else repr(bound), total))
+        return rows
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "avg": self.sum / self.count if self.count else 0.0,
+            "buckets": dict(self.cumulative()),
+        }
+
+
+class Metrics:
+    """In-process registry of counters and histograms."""
+
+    def __init__(self, namespace: str = "gui"):
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._counters: dict[str, dict[Labels, float]] = {}
+        self._histograms: dict[str, dict[Labels, Histogram]] = {}
+        self._buckets: dict[str, tuple[float, ...]] = {}
+        self._tracer: Any = None
+        self._engines: weakref.WeakSet = weakref.WeakSet()
+
+    def _name(self, name: str) -> str:
+        return f"{self.namespace}_{name}" if self.namespace else name
+
+    def register(self, name: str, buckets: tuple[float, ...]) -> None:
+        """Set custom bucket bounds for a histogram before first use."""
+        self._buckets[self._name(name)] = buckets
+
+    def inc(self, name: str, value: float = 1, **labels: Any) -> None:
+        key = _labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(self._name(name), {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        name = self._name(name)
+        key = _labels(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            if key not in series:
+                series[key] = Histogram(self._buckets.get(name, DEFAULT_BUCKETS))
+            series[key].observe(value)
+
+    @contextmanager
+    def timer(self, name: str, **labels: Any) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def record_cache(self, cache: str, hit: bool) -> None:
+        self.inc("cache_hits_total" if hit else "cache_misses_total", cache=cache)
+
+    def cache_hit_rate(self, cache: str) -> float:
+        key = _labels({"cache": cache})
+        with self._lock:
+            hits = self._counters.get(self._name("cache_hits_total"), {}).get(key, 0)
+            misses = self._counters.get(self._name("cache_misses_total"), {}).get(
+                key, 0
+            )
+        total = hits + misses
+        return hits / total if total else 0.0
+
+    def span(self, name: str, **attributes: Any):
+        """OpenTelemetry span when the SDK is installed, otherwise a no-op."""
+        if self._tracer is None:
+            try:
+                from opentelemetry import trace  # type: ignore[import-not-found]
+
+                self._tracer = trace.get_tracer(self.namespace)
+            except ImportError:
+                self._tracer = False
+        if not self._tracer:
+            return nullcontext()
+        return self._tracer.start_as_current_span(name, attributes=attributes)
+
+    def instrument_engine(self, engine: Any) -> Any:
+        """Record query timings for a (sync or async) SQLAlchemy engine."""
+        from sqlalchemy import event
+
+        target = getattr(engine, "sync_engine", engine)
+        if target in self._engines:
+            return engine
+        self._engines.add(target)
+
+        @event.listens_for(target, "before_cursor_execute")
+        def _before(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+        @event.listens_for(target, "after_cursor_execute")
+        def _after(conn, cursor, statement, parameters, context, executemany):
+            started = conn.info["query_start"].pop()
+            operation = statement.lstrip().split(None, 1)[0].upper()
+            self.observe(
+                "db_query_seconds", time.perf_counter() - started, operation=operation
+            )
+
+        @event.listens_for(target, "handle_error")
+        def _error(context):
+            conn = context.connection
+            stack = conn.info.get("query_start") if conn is not None else None
+            if stack:
+                stack.pop()
+            self.inc("db_errors_total")
+
+        return engine
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "counters": {
+                    name: [{"labels": dict(k), "value": v} for k, v in series.items()]
+                    for name, series in self._counters.items()
+                },
+                "histograms": {
+                    name: [
+                        {"labels": dict(k), **h.to_dict()} for k, h in series.items()
+                    ]
+                    for name, series in self._histograms.items()
+                },
+            }
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot())
+
+    def to_prometheus(self) -> str:
+        lines: list[str] = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                lines.append(f"# TYPE {name} counter")
+                for key, value in series.items():
+                    lines.append(f"{name}{_format_labels(key)} {value}")
+            for name, series in sorted(self._histograms.items()):
+                lines.append(f"# TYPE {name} histogram")
+                for key, hist in series.items():
+                    for bound, total in hist.cumulative():
+                        labels = _format_labels(key, ("le", bound))
+                        lines.append(f"{name}_bucket{labels} {total}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {hist.sum}")
+                    lines.append(f"{name}_count{_format_labels(key)} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+    def serve(self, host: str = "127.0.0.1", port: int = 9464) -> Any:
+        """Expose `/metrics` (Prometheus) and `/metrics.json` in a daemon thread."""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):  # pylint: disable=invalid-name
+                if self.path == "/metrics":
+                    body, kind = registry.to_prometheus(), "text/plain; version=0.0.4"
+                elif self.path == "/metrics.json":
+                    body, kind = registry.to_json(), "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                data = body.encode()
+                self.send_response(200)
+                self.send_header("Content-Type", kind)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+metrics = Metrics()
+metrics.register("ollama_tokens_per_second", RATE_BUCKETS)
@@ -0,0 +1,66 @@
+import asyncio
+import atexit
+import threading
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+R = TypeVar("R")
+
+
+class Portal:
+    """
+    Long-lived event loop on a daemon thread for synchronous callers.
+
+    Coroutines submitted with `call` run on the same loop every time, so
+    loop-bound resources (HTTP connection pools, async DB engines) are created
+    once and reused instead of being rebuilt by `asyncio.run` per call.
+    """
+
+    def __init__(self, name: str = "gui-portal"):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            with self._lock:
+                if self._loop is None:
+                    self._start()
+        assert self._loop is not None
+        return self._loop
+
+    def _start(self) -> None:
+        loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def run() -> None:
+            asyncio.set_event_loop(loop)
+            loop.call_soon(ready.set)
+            loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name=self.name, daemon=True)
+        self._thread.start()
+        ready.wait()
+        self._loop = loop
+
+    def call(self, func: Callable[..., Awaitable[R]], *args: Any, **kwargs: Any) -> R:
+        """Run `func(*args, **kwargs)` on the portal loop and wait for the result."""
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("Portal.call() would deadlock on the portal thread.")
+        future = asyncio.run_coroutine_threadsafe(func(*args, **kwargs), self.loop)
+        return future.result()
+
+    def stop(self) -> None:
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None or thread is None:
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        loop.close()
+
+
+portal = Portal()
+atexit.register(portal.stop)
@@ -0,0 +1,82 @@
+import struct
+import sys
+from array import array
+from typing import Any, Iterable, Literal
+
+Dtype = Literal["float32", "float16", "int8"]
+
+_CODES: dict[str, int] = {"float32": 1, "float16": 2, "int8": 3}
+_NAMES = {code: name for name, code in _CODES.items()}
+_HEADER = struct.Struct("<BfI")  # dtype code, scale, dimensions
+
+
+def to_float32(values: Iterable[float]) -> array:
+    """Pack an embedding into a contiguous float32 buffer (4 bytes per value)."""
+    if isinstance(values, array) and values.typecode == "f":
+        return values
+    return array("f", values)
+
+
+def as_numpy(vector: array) -> Any:
+    """Zero-copy `numpy.float32` view over a float32 buffer."""
+    import numpy as np
+
+    return np.frombuffer(vector, dtype=np.float32)
+
+
+def quantize_int8(vector: array) -> tuple[array, float]:
+    """Symmetric int8 quantization; returns the codes and their scale factor."""
+    peak = max((abs(v) for v in vector), default=0.0)
+    scale = peak / 127 if peak else 1.0
+    return array("b", (round(v / scale) for v in vector)), scale
+
+
+def dequantize_int8(codes: array, scale: float) -> array:
+    return array("f", (c * scale for c in codes))
+
+
+def _little_endian(vector: array) -> array:
+    """Blobs are little-endian like the header; swap on big-endian hosts."""
+    if sys.byteorder == "little":
+        return vector
+    swapped = array(vector.typecode, vector)
+    swapped.byteswap()
+    return swapped
+
+
+def pack(vector: Iterable[float], dtype: Dtype = "float32") -> bytes:
+    """
+    Serialize an embedding for storage in an index or cache.
+
+    The blob carries its own header (dtype, scale, dimensions) so `unpack`
+    needs no side information. float16 halves and int8 quarters the size of
+    float32 storage.
+    """
+    vector = to_float32(vector)
+    scale = 1.0
+    if dtype == "float32":
+        body = _little_endian(vector).tobytes()
+    elif dtype == "float16":
+        body = struct.pack(f"<{len(vector)}e", *vector)
+    elif dtype == "int8":
+        codes, scale = quantize_int8(vector)
+        body = codes.tobytes()
+    else:
+        raise ValueError(f"Unsupported dtype: {dtype}")
+    return _HEADER.pack(_CODES[dtype], scale, len(vector)) + body
+
+
+def unpack(blob: bytes) -> array:
+    """Decode a blob written by `pack` back into a float32 buffer."""
+    code, scale, dim = _HEADER.unpack_from(blob)
+    body = memoryview(blob)[_HEADER.size :]
+    dtype = _NAMES.get(code)
+    if dtype == "float32":
+        vector = array("f")
+        vector.frombytes(body)
+        return _little_endian(vector)
+    if dtype == "float16":
+        return array("f", struct.unpack(f"<{dim}e", body))
+    if dtype == "int8":
+        return dequantize_int8(array("b", body.tobytes()), scale)
+    raise ValueError(f"Unknown vector encoding: {code}")
@@ -0,0 +1,23 @@
+"""ChatService with many concurrent sessions."""
+
+import asyncio
+
+from gui.services.chat import ChatService
+from gui.services.ollama import AiClient
+
+SESSIONS = 48
+
+
+def test_chat_sessions(benchmark, mock_ollama):
+    async def run():
+        async with AiClient(mock_ollama.base_url) as client:
+            service = ChatService(client, "tinyllama:latest", max_concurrency=16)
+
+            async def turn(i: int) -> int:
+                return len([t async for t in service.reply(f"s{i}", "hi")])
+
+            return sum(await asyncio.gather(*(turn(i) for i in range(SESSIONS))))
+
+    tokens = benchmark.run_async(run)
+    benchmark.extra_info["sessions_per_second"] = SESSIONS / benchmark.result.median
+    assert tokens > 0
@@ -0,0 +1,67 @@
+"""AiClient streaming throughput against the mock server."""
+
+from gui.services.ollama import AiClient
+
+MODEL = "tinyllama:latest"
+
+
+async def consume(stream) -> int:
+    chunks = 0
+    async for _ in await stream:
+        chunks += 1
+    return chunks
+
+
+def test_generate_stream(benchmark, mock_ollama):
+    async def run():
+        async with AiClient(mock_ollama.base_url) as client:
+            return await consume(client.generate("hi", MODEL, stream=True))
+
+    chunks = benchmark.run_async(run)
+    benchmark.extra_info["chunks_per_second"] = chunks / benchmark.result.median
+    assert chunks > 0
+
+
+def test_chat_stream(benchmark, mock_ollama):
+    messages = [{"role": "user", "content": "hi"}]
+
+    async def run():
+        async with AiClient(mock_ollama.base_url) as client:
+            return await consume(client.chat(messages, MODEL, stream=True))
+
+    chunks = benchmark.run_async(run)
+    benchmark.extra_info["chunks_per_second"] = chunks / benchmark.result.median
+    assert chunks > 0
+
+
+def test_generate_concurrent(benchmark, mock_ollama):
+    import asyncio
+
+    sessions = 32
+
+    async def run():
+        async with AiClient(mock_ollama.base_url) as client:
+            streams = [
+                client.generate("hi", MODEL, stream=True) for _ in range(sessions)
+            ]
+            return sum(await asyncio.gather(*(consume(s) for s in streams)))
+
+    chunks = benchmark.run_async(run)
+    benchmark.extra_info["chunks_per_second"] = chunks / benchmark.result.median
+    assert chunks > 0
+
+
+def test_run_sync(benchmark, mock_ollama):
+    """Blocking calls reuse one pool on the portal loop."""
+    client = AiClient(mock_ollama.base_url)
+    calls = 20
+
+    def run():
+        return sum(
+            len(client.run_sync("generate", "hi", MODEL, stream=True))
+            for _ in range(calls)
+        )
+
+    chunks = benchmark(run)
+    benchmark.extra_info["calls_per_second"] = calls / benchmark.result.median
+    assert chunks > 0
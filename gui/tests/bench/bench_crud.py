@@ -0,0 +1,50 @@
+"""CRUD bulk operations on an in-memory SQLite database."""
+
+import pytest
+from sqlalchemy import Column, String
+
+from gui.database.base import BaseModel
+from gui.database.crud import CRUD
+
+ROWS = 500
+
+
+class BenchItem(BaseModel):
+    __tablename__ = "bench_items"
+    name = Column(String, index=True)
+
+
+@pytest.fixture
+def store():
+    crud = CRUD(sync=True)
+    engine = crud.engine("sqlite://")
+    crud.create_all()
+    with crud.session(engine)() as db:
+        yield crud, db
+
+
+def test_crud_create(benchmark, store):
+    crud, db = store
+    items = crud.crud(BenchItem)
+
+    def run():
+        for i in range(ROWS):
+            items.create(db, {"name": f"item-{i}"})
+
+    benchmark(run)
+    benchmark.extra_info["rows_per_second"] = ROWS / benchmark.result.median
+
+
+def test_crud_filter_pages(benchmark, store):
+    crud, db = store
+    items = crud.crud(BenchItem)
+    db.add_all([BenchItem(name=f"item-{i}") for i in range(ROWS)])
+    db.commit()
+
+    def run():
+        total = 0
+        for page in range(1, ROWS // 100 + 1):
+            total += len(items.filter(db, page=page, items_per_page=100))
+        return total
+
+    assert benchmark(run) == ROWS
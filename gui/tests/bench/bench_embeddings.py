@@ -0,0 +1,58 @@
+"""Embedding ingest: many short chunks embedded with bounded concurrency."""
+
+import asyncio
+
+from gui.services.ollama import AiClient
+
+CHUNKS = 200
+CONCURRENCY = 16
+DTYPES = ("float32", "float16", "int8")
+
+
+def test_embedding_ingest(benchmark, mock_ollama):
+    async def run():
+        limit = asyncio.Semaphore(CONCURRENCY)
+        async with AiClient(mock_ollama.base_url) as client:
+
+            async def embed(i: int):
+                async with limit:
+                    async for vector in await client.embeddings(f"chunk {i}"):
+                        return vector
+
+            return await asyncio.gather(*(embed(i) for i in range(CHUNKS)))
+
+    vectors = benchmark.run_async(run)
+    benchmark.extra_info["vectors_per_second"] = CHUNKS / benchmark.result.median
+    assert len(vectors) == CHUNKS
+
+
+def test_embedding_storage(benchmark):
+    import sys
+
+    from mock_ollama import fake_embedding
+
+    from gui.utils.vectors import pack, to_float32, unpack
+
+    boxed = fake_embedding("storage", 768)
+    boxed_bytes = sys.getsizeof(boxed) + sum(sys.getsizeof(v) for v in boxed)
+    blobs = benchmark(lambda: [pack(boxed, dtype) for dtype in DTYPES])
+    for dtype, blob in zip(DTYPES, blobs):
+        benchmark.extra_info[f"{dtype}_bytes"] = len(blob)
+        assert len(unpack(blob)) == 768
+    benchmark.extra_info["list_bytes"] = boxed_bytes
+    assert sys.getsizeof(to_float32(boxed)) * 6 < boxed_bytes
+
+
+def test_embedding_cache(benchmark, mock_ollama, tmp_path):
+    """Repeated chunks are served from the float16 on-disk cache."""
+    from gui.services.embeddings import EmbeddingCache
+
+    cache = EmbeddingCache(tmp_path)
+
+    async def run():
+        async with AiClient(mock_ollama.base_url) as client:
+            return [await cache.embed(client, f"chunk {i}") for i in range(CHUNKS)]
+
+    vectors = benchmark.run_async(run)
+    benchmark.extra_info["vectors_per_second"] = CHUNKS / benchmark.result.median
+    assert len(vectors) == CHUNKS and len(list(tmp_path.rglob("*.vec"))) == CHUNKS
@@ -0,0 +1,90 @@
+"""Knowledge-base cleanup on a large tree: cold/warm scans, dry run, cleanup."""
+
+import os
+
+import pytest
+
+from gui.services.knowledge_base import INDEX_FILE, TRASH_DIR, KnowledgeBase
+
+NOTES = int(os.environ.get("BENCH_KB_NOTES", "30000"))
+PER_FOLDER = 30
+
+
+def build(root) -> dict[str, set[str]]:
+    """Write `NOTES` notes; returns the paths cleanup must keep and delete."""
+    keep: set[str] = set()
+    delete: set[str] = set()
+    for folder in range(NOTES // PER_FOLDER):
+        directory = root / "topics" / f"t{folder}"
+        directory.mkdir(parents=True)
+        latest = None
+        for i in range(PER_FOLDER):
+            rel = f"topics/t{folder}/note{i}.md"
+            if i % 10 == 3:
+                text, retained = "retain: true\n", True
+            elif i % 15 == 7:
+                text, retained = "pinned #pin\n", True
+            else:
+                text, retained = "draft\n", False
+            path = root / rel
+            path.write_text(f"# {rel}\n{text}")
+            os.utime(path, ns=(i * 10**9, i * 10**9))
+            (keep if retained else delete).add(rel)
+            if not retained:
+                latest = rel
+        delete.discard(latest)
+        keep.add(latest)
+    (root / "README.md").write_text("# KB\n")
+    return {"keep": keep, "delete": delete}
+
+
+@pytest.fixture(scope="module")
+def tree(tmp_path_factory):
+    root = tmp_path_factory.mktemp("kb")
+    return root, build(root)
+
+
+def test_kb_scan_cold(benchmark, tree):
+    root, _ = tree
+    kb = KnowledgeBase(root)
+
+    def run():
+        (root / INDEX_FILE).unlink(missing_ok=True)
+        return kb.scan()
+
+    notes, read = benchmark(run)
+    assert read == len(notes) == NOTES + 1
+    benchmark.extra_info["notes_per_second"] = NOTES / benchmark.result.median
+
+
+def test_kb_scan_warm(benchmark, tree):
+    root, _ = tree
+    kb = KnowledgeBase(root)
+    kb._save_index(kb.scan()[0])
+    notes, read = benchmark(kb.scan)
+    assert read == 0 and len(notes) == NOTES + 1
+    benchmark.extra_info["notes_per_second"] = NOTES / benchmark.result.median
+
+
+def test_kb_dry_run(benchmark, tree):
+    root, expected = tree
+    plan = benchmark(KnowledgeBase(root).cleanup, dry_run=True)
+    assert set(plan.keep) == expected["keep"]
+    assert set(plan.delete) == expected["delete"]
+    assert all((root / rel).exists() for rel in plan.delete)
+    assert not (root / TRASH_DIR).exists()
+
+
+def test_kb_cleanup(benchmark, tmp_path):
+    expected = build(tmp_path)
+    # Cleanup is destructive, so it is timed once on a fresh tree.
+    benchmark.rounds, benchmark.warmup = 1, 0
+    plan = benchmark(KnowledgeBase(tmp_path).cleanup)
+    assert set(plan.keep) == expected["keep"]
+    assert set(plan.delete) == expected["delete"]
+    assert all((tmp_path / rel).exists() for rel in expected["keep"])
+    assert not any((tmp_path / rel).exists() for rel in expected["delete"])
+    assert (tmp_path / "README.md").exists()
+    summaries = list((tmp_path / "retrospectives").glob("cleanup_*.md"))
+    assert len(summaries) == 1
+    benchmark.extra_info["notes_per_second"] = NOTES / benchmark.result.median
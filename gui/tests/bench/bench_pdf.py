@@ -0,0 +1,53 @@
+"""PDF extraction throughput: serial vs process pool, cold vs cached."""
+
+import os
+
+import pytest
+
+from gui.services.pdf import PdfExtractor
+
+PAGES = 200
+
+
+@pytest.fixture(scope="module")
+def manual(tmp_path_factory):
+    pymupdf = pytest.importorskip("pymupdf")
+    path = tmp_path_factory.mktemp("pdf") / "manual.pdf"
+    with pymupdf.open() as doc:
+        for i in range(PAGES):
+            page = doc.new_page()
+            page.insert_textbox(page.rect + (72, 72, -72, -72), f"{i} " * 400)
+        doc.save(path)
+    return path
+
+
+@pytest.mark.parametrize("workers", sorted({1, os.cpu_count() or 1}))
+def test_pdf_cold(benchmark, manual, tmp_path, workers):
+    runs = iter(range(1_000))
+
+    def run():
+        cache = tmp_path / f"cache-{next(runs)}"
+        with PdfExtractor(cache, workers=workers) as extractor:
+            return extractor.extract(manual)
+
+    benchmark(run)
+    benchmark.extra_info["pages_per_second"] = PAGES / benchmark.result.median
+
+
+def test_pdf_cached(benchmark, manual, tmp_path):
+    with PdfExtractor(tmp_path) as extractor:
+        extractor.extract(manual)
+        benchmark(extractor.extract, manual)
+    benchmark.extra_info["pages_per_second"] = PAGES / benchmark.result.median
+
+
+@pytest.mark.parametrize("mode", ["fast", "layout"])
+def test_pdf_mode(benchmark, manual, tmp_path, mode):
+    runs = iter(range(1_000))
+
+    def run():
+        with PdfExtractor(tmp_path / f"cache-{next(runs)}") as extractor:
+            return extractor.extract(manual, mode)
+
+    assert benchmark(run)
+    benchmark.extra_info["pages_per_second"] = PAGES / benchmark.result.median
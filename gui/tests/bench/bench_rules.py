@@ -0,0 +1,59 @@
+"""Rule selection: index lookups, cached lookups and incremental re-index."""
+
+import os
+
+import pytest
+
+from gui.services.rules import RuleEngine
+
+RULES = 300
+PATHS = [f"src/mod{i % 400}/pkg/file{i}.py" for i in range(2_000)]
+
+
+@pytest.fixture
+def rules_dir(tmp_path):
+    for i in range(RULES):
+        (tmp_path / f"rule{i}.mdc").write_text(
+            f"---\ndescription: rule {i}\n"
+            f"globs: *.ext{i}, src/mod{i}/**/*.py, docs/{i}/*.{{md,mdx}}\n"
+            f"alwaysApply: {'true' if i % 50 == 0 else 'false'}\n---\nbody {i}\n"
+        )
+    return tmp_path
+
+
+def test_rules_for_path_cold(benchmark, rules_dir):
+    engine = RuleEngine(rules_dir)
+    engine.refresh()
+
+    def run():
+        engine._cache.clear()
+        return sum(len(engine.for_path(path)) for path in PATHS)
+
+    assert benchmark(run) > 0
+    benchmark.extra_info["us_per_lookup"] = benchmark.result.median / len(PATHS) * 1e6
+
+
+def test_rules_for_path_cached(benchmark, rules_dir):
+    engine = RuleEngine(rules_dir)
+    engine.refresh()
+
+    def run():
+        return sum(len(engine.for_path(path)) for path in PATHS)
+
+    assert benchmark(run) > 0
+    benchmark.extra_info["us_per_lookup"] = benchmark.result.median / len(PATHS) * 1e6
+
+
+def test_rules_refresh_one_changed(benchmark, rules_dir):
+    engine = RuleEngine(rules_dir)
+    engine.refresh()
+    target = rules_dir / "rule7.mdc"
+    edits = iter(range(1_000_000))
+
+    def run():
+        edit = next(edits)
+        target.write_text(f"---\nglobs: *.edit{edit}\n---\nedited\n")
+        os.utime(target, ns=(edit, edit))
+        return engine.refresh()
+
+    assert benchmark(run) == ["rule7"]
@@ -0,0 +1,40 @@
+"""Cold-start cost of importing the package in a fresh interpreter."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+SNIPPETS = {
+    "package": "import gui",
+    "cli": "from gui.services.knowledge_base import main",
+    "client": "from gui.services import AiClient; AiClient()",
+    "controller": "from gui.database import Controller; Controller()",
+}
+# Median seconds per snippet, interpreter start-up included. The controller
+# imports SQLAlchemy by design; everything else must stay under 100 ms.
+BUDGETS = {"package": 0.1, "cli": 0.1, "client": 0.15, "controller": 0.5}
+BUDGET_SCALE = float(os.environ.get("BENCH_BUDGET_SCALE", "1"))
+
+
+@pytest.mark.parametrize("snippet", SNIPPETS, ids=list(SNIPPETS))
+def test_import_time(benchmark, snippet):
+    def run():
+        subprocess.run([sys.executable, "-c", SNIPPETS[snippet]], check=True)
+
+    benchmark(run)
+    budget = BUDGETS[snippet] * BUDGET_SCALE
+    benchmark.extra_info["budget_seconds"] = budget
+    assert (
+        benchmark.result.median <= budget
+    ), f"{snippet}: {benchmark.result.median:.3f}s over {budget:.3f}s budget"
+
+
+def test_import_is_lazy():
+    code = (
+        "import sys, gui, gui.database, gui.services;"
+        "heavy = {'sqlalchemy', 'httpx', 'chromadb', 'fitz'} & set(sys.modules);"
+        "assert not heavy, heavy"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
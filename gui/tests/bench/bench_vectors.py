@@ -0,0 +1,32 @@
+"""Vector search over an in-memory Chroma collection."""
+
+import pytest
+from mock_ollama import fake_embedding
+
+DOCS = 2_000
+DIM = 384
+
+
+@pytest.fixture(scope="module")
+def collection():
+    chromadb = pytest.importorskip("chromadb")
+    client = chromadb.EphemeralClient()
+    collection = client.get_or_create_collection("bench_docs")
+    ids = [f"doc-{i}" for i in range(DOCS)]
+    embeddings = [fake_embedding(doc_id, DIM) for doc_id in ids]
+    for start in range(0, DOCS, 500):
+        collection.add(
+            ids=ids[start : start + 500], embeddings=embeddings[start : start + 500]
+        )
+    return collection
+
+
+def test_vector_search(benchmark, collection):
+    queries = [fake_embedding(f"query-{i}", DIM) for i in range(50)]
+
+    def run():
+        return collection.query(query_embeddings=queries, n_results=5)
+
+    results = benchmark(run)
+    benchmark.extra_info["queries_per_second"] = len(queries) / benchmark.result.median
+    assert len(results["ids"]) == len(queries)
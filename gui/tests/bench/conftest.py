@@ -0,0 +1,39 @@
+"""
+Fixtures for the benchmark suites in this folder.
+
+Benchmark modules are named `bench_*.py` so the regular test run skips them;
+use `run.py` (or pass the files to pytest explicitly) to execute them.
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+from harness import Benchmark, Result, save
+from mock_ollama import MockOllama
+
+ROUNDS = int(os.environ.get("BENCH_ROUNDS", "5"))
+RESULTS: list[Result] = []
+
+
+@pytest.fixture(scope="session")
+def mock_ollama():
+    with MockOllama(
+        latency=float(os.environ.get("BENCH_LATENCY", "0.001")),
+        tokens_per_second=float(os.environ.get("BENCH_TOKENS_PER_SECOND", "0")),
+        tokens=int(os.environ.get("BENCH_TOKENS", "128")),
+    ) as server:
+        yield server
+
+
+@pytest.fixture
+def benchmark(request):
+    bench = Benchmark(request.node.name, rounds=ROUNDS)
+    yield bench
+    if bench.result:
+        RESULTS.append(bench.result)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if (target := os.environ.get("BENCH_SAVE")) and RESULTS:
+        save(RESULTS, Path(target))
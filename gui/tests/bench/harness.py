@@ -0,0 +1,113 @@
+"""
+Lightweight benchmark harness (pytest-benchmark style).
+
+Results are stored as JSON and compared with `compare()` to flag regressions.
+"""
+
+import asyncio
+import json
+import platform
+import statistics
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional
+
+
+@dataclass
+class Result:
+    name: str
+    rounds: int
+    min: float
+    max: float
+    mean: float
+    median: float
+    stddev: float
+    extra_info: dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_timings(
+        cls, name: str, timings: list[float], extra_info: dict[str, Any]
+    ) -> "Result":
+        return cls(
+            name=name,
+            rounds=len(timings),
+            min=min(timings),
+            max=max(timings),
+            mean=statistics.fmean(timings),
+            median=statistics.median(timings),
+            stddev=statistics.stdev(timings) if len(timings) > 1 else 0.0,
+            extra_info=extra_info,
+        )
+
+
+class Benchmark:
+    """Callable timer handed to each benchmark as the `benchmark` fixture."""
+
+    def __init__(self, name: str, rounds: int = 5, warmup: int = 1):
+        self.name = name
+        self.rounds = rounds
+        self.warmup = warmup
+        self.extra_info: dict[str, Any] = {}
+        self.result: Optional[Result] = None
+
+    def __call__(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        value = None
+        for _ in range(self.warmup):
+            func(*args, **kwargs)
+        timings = []
+        for _ in range(self.rounds):
+            start = time.perf_counter()
+            value = func(*args, **kwargs)
+            timings.append(time.perf_counter() - start)
+        self.result = Result.from_timings(self.name, timings, self.extra_info)
+        return value
+
+    def run_async(self, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """Time a coroutine function; all rounds share one event loop."""
+
+        async def rounds() -> Any:
+            value = None
+            for _ in range(self.warmup):
+                await func(*args, **kwargs)
+            timings = []
+            for _ in range(self.rounds):
+                start = time.perf_counter()
+                value = await func(*args, **kwargs)
+                timings.append(time.perf_counter() - start)
+            self.result = Result.from_timings(self.name, timings, self.extra_info)
+            return value
+
+        return asyncio.run(rounds())
+
+
+def save(results: list[Result], path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {
+        "machine_info": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+        },
+        "datetime": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "benchmarks": [asdict(r) for r in results],
+    }
+    path.write_text(json.dumps(data, indent=2))
+
+
+def load(path: Path) -> dict[str, dict[str, Any]]:
+    data = json.loads(path.read_text())
+    return {b["name"]: b for b in data["benchmarks"]}
+
+
+def compare(
+    base: Path, current: Path, threshold: float = 0.10, stat: str = "median"
+) -> list[tuple[str, float, float, float, bool]]:
+    """Return `(name, base, current, change, regressed)` rows for shared benchmarks."""
+    old, new = load(base), load(current)
+    rows = []
+    for name in sorted(old.keys() & new.keys()):
+        before, after = old[name][stat], new[name][stat]
+        change = (after - before) / before if before else 0.0
+        rows.append((name, before, after, change, change > threshold))
+    return rows
@@ -0,0 +1,237 @@
+"""
+Local stand-in for the Ollama HTTP API.
+
+Serves `/api/generate`, `/api/chat`, `/api/embeddings` and `/api/tags` with
+configurable latency and token rate so benchmarks are reproducible without a
+live model. Standard library only.
+
+    with MockOllama(latency=0.01, tokens_per_second=200) as server:
+        client = AiClient(server.base_url)
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+WORDS = (
+    "the quick brown fox jumps over the lazy dog while the model keeps talking".split()
+)
+
+
+@dataclass
+class MockConfig:
+    latency: float = 0.0  # seconds before the first byte
+    tokens_per_second: float = 0.0  # 0 = as fast as possible
+    tokens: int = 64  # tokens per completion
+    dim: int = 768  # embedding dimensions
+    models: list[str] = field(
+        default_factory=lambda: ["tinyllama:latest", "nomic-embed-text:latest"]
+    )
+
+
+def fake_embedding(prompt: str, dim: int) -> list[float]:
+    """Deterministic unit vector derived from the prompt."""
+    seed = int.from_bytes(hashlib.sha256(prompt.encode()).digest()[:8], "little")
+    values = [math.sin(seed % 9973 + i * 0.618) for i in range(dim)]
+    norm = math.sqrt(sum(v * v for v in values)) or 1.0
+    return [v / norm for v in values]
+
+
+class MockOllama:
+    """Minimal HTTP/1.1 server running on a background event loop."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        config: Optional[MockConfig] = None,
+        **options: Any,
+    ):
+        self.host = host
+        self.port = port
+        self.config = config or MockConfig(**options)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> "MockOllama":
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    def stop(self) -> None:
+        if self._loop and self._server:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop)
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    async def _shutdown(self) -> None:
+        self._server.close()
+        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        asyncio.get_running_loop().stop()
+
+    def __enter__(self) -> "MockOllama":
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        self._server = self._loop.run_until_complete(
+            asyncio.start_server(self._handle, self.host, self.port)
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        self._loop.run_forever()
+        self._loop.close()
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while request := await self._read_request(reader):
+                method, path, body = request
+                await self._dispatch(writer, method, path, body)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_request(reader: asyncio.StreamReader):
+        line = await reader.readline()
+        if not line:
+            return None
+        method, path, _ = line.decode().split(" ", 2)
+        length = 0
+        while (header := await reader.readline()) not in (b"\r\n", b""):
+            name, _, value = header.decode().partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+        body = json.loads(await reader.readexactly(length)) if length else {}
+        return method, path, body
+
+    async def _dispatch(self, writer, method: str, path: str, body: dict) -> None:
+        if self.config.latency:
+            await asyncio.sleep(self.config.latency)
+        if path == "/api/tags":
+            models = [
+                {
+                    "name": name,
+                    "modified_at": "2025-01-01T00:00:00Z",
+                    "size": 1,
+                    "digest": hashlib.sha256(name.encode()).hexdigest(),
+                    "details": {},
+                }
+                for name in self.config.models
+            ]
+            await self._send_json(writer, {"models": models})
+        elif path == "/api/embeddings":
+            embedding = fake_embedding(body.get("prompt", ""), self.config.dim)
+            await self._send_json(writer, {"embedding": embedding})
+        elif path in ("/api/generate", "/api/chat"):
+            chat = path == "/api/chat"
+            if body.get("stream", True):
+                await self._stream_tokens(writer, body.get("model", ""), chat)
+            else:
+                await self._send_json(writer, self._completion(body, chat))
+        else:
+            await self._send(writer, 404, b'{"error": "not found"}')
+
+    def _frame(self, model: str, token: str, chat: bool, done: bool) -> dict:
+        frame: dict[str, Any] = {"model": model, "done": done}
+        if chat:
+            frame["message"] = {"role": "assistant", "content": token}
+        else:
+            frame["response"] = token
+        return frame
+
+    def _final(self, frame: dict, elapsed: float) -> dict:
+        frame["eval_count"] = self.config.tokens
+        frame["eval_duration"] = max(int(elapsed * 1e9), 1)
+        return frame
+
+    def _completion(self, body: dict, chat: bool) -> dict:
+        started = time.perf_counter()
+        text = " ".join(WORDS[i % len(WORDS)] for i in range(self.config.tokens))
+        frame = self._frame(body.get("model", ""), text, chat, done=True)
+        return self._final(frame, time.perf_counter() - started)
+
+    async def _stream_tokens(self, writer, model: str, chat: bool) -> None:
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: application/x-ndjson\r\n"
+            b"Transfer-Encoding: chunked\r\n\r\n"
+        )
+        delay = (
+            1 / self.config.tokens_per_second if self.config.tokens_per_second else 0
+        )
+        started = time.perf_counter()
+        for i in range(self.config.tokens):
+            token = WORDS[i % len(WORDS)] + " "
+            await self._write_chunk(writer, self._frame(model, token, chat, False))
+            if delay:
+                await asyncio.sleep(delay)
+        final = self._final(
+            self._frame(model, "", chat, True), time.perf_counter() - started
+        )
+        await self._write_chunk(writer, final)
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    @staticmethod
+    async def _write_chunk(writer, data: dict) -> None:
+        line = json.dumps(data).encode() + b"\n"
+        writer.write(f"{len(line):x}\r\n".encode() + line + b"\r\n")
+        await writer.drain()
+
+    async def _send_json(self, writer, data: dict) -> None:
+        await self._send(writer, 200, json.dumps(data).encode())
+
+    @staticmethod
+    async def _send(writer, status: int, payload: bytes) -> None:
+        reason = "OK" if status == 200 else "Not Found"
+        writer.write(
+            f"HTTP/1.1 {status} {reason}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(payload)}\r\n\r\n".encode() + payload
+        )
+        await writer.drain()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run a mock Ollama server.")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--tokens-per-second", type=float, default=0.0)
+    parser.add_argument("--tokens", type=int, default=64)
+    args = parser.parse_args()
+
+    server = MockOllama(
+        port=args.port,
+        latency=args.latency,
+        tokens_per_second=args.tokens_per_second,
+        tokens=args.tokens,
+    ).start()
+    print(f"Mock Ollama listening on {server.base_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.stop()
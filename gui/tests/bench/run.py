@@ -0,0 +1,63 @@
+"""
+Run the benchmark suites and compare against a baseline.
+
+    uv run python tests/bench/run.py --save tests/bench/results/current.json
+    uv run python tests/bench/run.py --save new.json --compare base.json
+    uv run python tests/bench/run.py compare base.json new.json --threshold 0.15
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+import pytest
+from harness import compare
+
+HERE = Path(__file__).parent
+
+
+def report(base: Path, current: Path, threshold: float) -> int:
+    regressions = 0
+    for name, before, after, change, regressed in compare(base, current, threshold):
+        flag = "REGRESSION" if regressed else "ok"
+        regressions += regressed
+        print(f"{name:<32} {before:>10.4f}s {after:>10.4f}s {change:>+8.1%}  {flag}")
+    return 1 if regressions else 0
+
+
+def main(argv: list[str]) -> int:
+    if argv[:1] == ["compare"]:
+        parser = argparse.ArgumentParser(prog="run.py compare")
+        parser.add_argument("base", type=Path)
+        parser.add_argument("current", type=Path)
+        parser.add_argument("--threshold", type=float, default=0.10)
+        args = parser.parse_args(argv[1:])
+        return report(args.base, args.current, args.threshold)
+
+    parser = argparse.ArgumentParser(prog="run.py")
+    parser.add_argument("--save", type=Path, default=HERE / "results" / "latest.json")
+    parser.add_argument("--compare", type=Path, help="baseline results to diff against")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    parser.add_argument("-k", dest="keyword", help="only run matching benchmarks")
+    args = parser.parse_args(argv)
+
+    os.environ["BENCH_SAVE"] = str(args.save)
+    pytest_args = [
+        "-q",
+        "-p",
+        "no:cacheprovider",
+        *map(str, sorted(HERE.glob("bench_*.py"))),
+    ]
+    if args.keyword:
+        pytest_args += ["-k", args.keyword]
+    if code := pytest.main(pytest_args):
+        return int(code)
+    print(f"Results written to {args.save}")
+    if args.compare:
+        return report(args.compare, args.save, args.threshold)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
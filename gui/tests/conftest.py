@@ -0,0 +1,16 @@
+"""Shared fixtures for the unit tests (the bench suites have their own)."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent / "bench"))
+
+from mock_ollama import MockOllama  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def ollama():
+    with MockOllama(latency=0, tokens=8) as server:
+        yield server
@@ -81,7 +81,7 @@ if __name__ == "__main__":
             conditions=[
                 and_(
                     User.name.startswith("J"),
-                    # not_(User.deleted_at.isnot(None)),
+                    # Soft-deleted rows are excluded unless include_deleted=True.
                 )
             ],
         )
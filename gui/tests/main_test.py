@@ -2,7 +2,6 @@
 import asyncio
 import logging
 from typing import Optional, List, Dict
-from itertools import chain
 
 # Local Imports
 # Assuming AiClient is a class you've defined to interact with an AI model.
@@ -143,17 +142,14 @@ class Test:
             model: The name of the AI model to use for generating the embedding.
 
         Returns:
-            A list of floating-point numbers representing the vector embedding of the prompt.
+            A float32 `array` holding the vector embedding of the prompt.
             The exact dimensionality and values depend on the specific embedding model used.
         """
-        # Initialize an empty list to store the chunks of the embedding vector.
-        output: List[List[float]] = []
-        # Asynchronously iterate through the chunks of the embedding.
-        # The 'stream=True' argument suggests that the embeddings might be returned in parts.
-        async for chunk in await self.client.embeddings(prompt, model, stream=True):
-            output.append(chunk)
-        # 'chain.from_iterable' flattens the list of lists into a single list of numbers.
-        return list(chain.from_iterable(output))
+        # The client yields the whole embedding as one compact float32 buffer,
+        # so there is nothing to chain or copy: return the first item as-is.
+        async for vector in await self.client.embeddings(prompt, model, stream=True):
+            return vector
+        return None
 
 
 async def main():
@@ -0,0 +1,88 @@
+import asyncio
+
+from gui.services.chat import ChatServer, ChatService, MemoryStore
+from gui.services.ollama import AiClient
+
+MODEL = "tinyllama:latest"
+PORT = 8791
+
+
+def test_abandoned_turn_does_not_cancel_the_next(ollama):
+    async def run():
+        store = MemoryStore()
+        async with AiClient(ollama.base_url) as client:
+            service = ChatService(client, MODEL, store=store)
+            async for _ in service.reply("s", "first"):
+                break
+            tokens = [t async for t in service.reply("s", "second")]
+        return tokens, await store.load("s")
+
+    tokens, history = asyncio.run(run())
+    assert tokens
+    assert [m["content"] for m in history if m["role"] == "user"] == ["second"]
+
+
+def test_new_turn_cancels_running_generation(ollama):
+    async def run():
+        async with AiClient(ollama.base_url) as client:
+            service = ChatService(client, MODEL)
+            first = service.reply("s", "first")
+            await anext(first)
+            second = [t async for t in service.reply("s", "second")]
+            try:
+                async for _ in first:
+                    pass
+            except asyncio.CancelledError:
+                return second, True
+            return second, False
+
+    second, cancelled = asyncio.run(run())
+    assert second and cancelled
+
+
+async def _post(port: int, path: str, body: bytes) -> str:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(
+        f"POST {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    response = (await reader.read()).decode()
+    writer.close()
+    return response.split("\r\n\r\n", 1)[1]
+
+
+def test_server_reports_failures_as_error_events(ollama):
+    async def failing_retriever(query: str) -> list[str]:
+        raise RuntimeError("embedding failed")
+
+    async def run():
+        store = MemoryStore()
+        async with AiClient(ollama.base_url) as client:
+            service = ChatService(client, MODEL, store, failing_retriever)
+            server = ChatServer(service, port=PORT)
+            serving = asyncio.create_task(server.serve())
+            await asyncio.sleep(0.1)
+            body = await _post(PORT, "/sessions/s/messages", b'{"content":"hi"}')
+            serving.cancel()
+            await asyncio.gather(serving, return_exceptions=True)
+        return body, await store.load("s")
+
+    body, history = asyncio.run(run())
+    assert body.startswith("event: error")
+    assert "embedding failed" in body
+    assert history == []
+
+
+def test_upstream_error_is_not_persisted():
+    async def run():
+        store = MemoryStore()
+        async with AiClient("http://127.0.0.1:9") as client:
+            service = ChatService(client, MODEL, store=store)
+            try:
+                async for _ in service.reply("s", "hi"):
+                    pass
+            except Exception as e:
+                return type(e).__name__, await store.load("s")
+
+    name, history = asyncio.run(run())
+    assert name == "ChatError" and history == []
@@ -0,0 +1,170 @@
+import asyncio
+import time
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import create_engine, event, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from gui.database.base import BaseModel
+from gui.database.crud import CRUDAsync, CRUDSync
+from gui.database.maintenance import PurgeJob
+from gui.database.models import Conversation, Message, Template
+from gui.utils.time import Date
+
+
+@pytest.fixture(params=[False, True], ids=["fk-off", "fk-on"])
+def db(request):
+    engine = create_engine("sqlite://")
+    if request.param:
+
+        @event.listens_for(engine, "connect")
+        def enforce_foreign_keys(conn, _):
+            conn.execute("PRAGMA foreign_keys=ON")
+
+    BaseModel.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as session:
+        yield session
+    engine.dispose()
+
+
+def insert_raw(db, name: str) -> None:
+    """A row written outside the ORM, so only the server defaults apply."""
+    # SQLite's clock has millisecond resolution; step past the previous row's.
+    time.sleep(0.002)
+    db.execute(
+        text(
+            "INSERT INTO templates (name, body, args, meta) VALUES (:n, '', '{}', '{}')"
+        ),
+        {"n": name},
+    )
+    db.commit()
+
+
+def test_changed_since_pages_through_orm_and_raw_rows(db):
+    crud = CRUDSync(Template)
+    seen: list[str] = []
+    cursor = (None, 0)
+
+    def drain() -> None:
+        nonlocal cursor
+        while page := crud.changed_since(db, *cursor, limit=2):
+            seen.extend(row.name for row in page)
+            cursor = (page[-1].updated_at, page[-1].id)
+
+    for i in range(3):
+        crud.create(db, {"name": f"orm{i}", "body": ""})
+    drain()
+    insert_raw(db, "raw0")
+    crud.create(db, {"name": "orm3", "body": ""})
+    insert_raw(db, "raw1")
+    drain()
+
+    assert seen == ["orm0", "orm1", "orm2", "raw0", "orm3", "raw1"]
+
+
+def test_raw_insert_timestamps_match_orm_precision(db):
+    insert_raw(db, "raw")
+    row = CRUDSync(Template).filter_by(db, {"name": "raw"})[0]
+    assert row.created_at == row.updated_at
+    assert row.updated_at.microsecond % 1000 == 0
+    assert abs(row.updated_at - Date.datetime().replace(tzinfo=None)) < timedelta(
+        seconds=5
+    )
+
+
+def test_soft_deleted_rows_are_hidden_unless_asked_for(db):
+    crud = CRUDSync(Template)
+    kept = crud.create(db, {"name": "kept", "body": ""})
+    gone = crud.create(db, {"name": "gone", "body": ""})
+    crud.soft_delete(db, gone.id)
+
+    assert [t.name for t in crud.filter(db)] == ["kept"]
+    assert crud.detail(db, gone.id) is None
+    assert crud.filter_by(db, {"name": "gone"}) == []
+    assert {t.name for t in crud.filter(db, include_deleted=True)} == {"kept", "gone"}
+    assert crud.detail(db, gone.id, include_deleted=True).deleted_at is not None
+    assert crud.update(db, gone.id, {"body": "x"}) is None
+    assert crud.detail(db, kept.id).deleted_at is None
+
+
+def test_update_with_include_deleted_restores_a_row(db):
+    crud = CRUDSync(Template)
+    row = crud.create(db, {"name": "t", "body": ""})
+    crud.soft_delete(db, row.id)
+
+    restored = crud.update(
+        db, row.id, {"deleted_at": None, "body": "back"}, include_deleted=True
+    )
+    assert restored.deleted_at is None
+    assert crud.detail(db, row.id).body == "back"
+
+
+def test_purge_deleted_runs_in_batches_and_cascades_to_messages(db):
+    conversations = CRUDSync(Conversation)
+    messages = CRUDSync(Message)
+    ids = [conversations.create(db, {"session": f"s{i}"}).id for i in range(5)]
+    messages.bulk_create(
+        db,
+        [
+            {"conversation_id": id, "seq": seq, "role": "user", "content": "hi"}
+            for id in ids
+            for seq in (1, 2)
+        ],
+    )
+    for id in ids[:4]:
+        conversations.soft_delete(db, id)
+    commits = []
+    event.listen(db, "after_commit", commits.append)
+
+    purged = conversations.purge_deleted(
+        db, Date.datetime() + timedelta(seconds=1), batch_size=3
+    )
+
+    assert purged == 4
+    assert len(commits) == 2
+    remaining = conversations.filter(db, include_deleted=True)
+    assert [c.id for c in remaining] == ids[4:]
+    orphans = select(func.count()).select_from(Message)
+    assert db.scalar(orphans.where(Message.conversation_id.not_in(ids[4:]))) == 0
+    assert db.scalar(orphans) == 2
+
+
+def test_purge_keeps_recent_tombstones(db):
+    crud = CRUDSync(Template)
+    row = crud.create(db, {"name": "t", "body": ""})
+    crud.soft_delete(db, row.id)
+
+    assert crud.purge_deleted(db, Date.datetime() - timedelta(days=1)) == 0
+    assert crud.detail(db, row.id, include_deleted=True) is not None
+
+
+def test_purge_job_purges_through_async_sessions(tmp_path):
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(BaseModel.metadata.create_all)
+        session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        crud = CRUDAsync(Conversation)
+        async with session() as db:
+            for i in range(5):
+                row = await crud.create(db, {"session": f"s{i}"})
+                await CRUDAsync(Message).create(
+                    db,
+                    {
+                        "conversation_id": row.id,
+                        "seq": 1,
+                        "role": "user",
+                        "content": "",
+                    },
+                )
+                await crud.soft_delete(db, row.id)
+        job = PurgeJob(session, [Conversation], retention=timedelta(0), batch_size=2)
+        purged = await job.run_once()
+        async with session() as db:
+            left = await db.scalar(select(func.count()).select_from(Message))
+        await engine.dispose()
+        return purged, left
+
+    assert asyncio.run(run()) == ({"conversations": 5}, 0)
@@ -0,0 +1,66 @@
+import asyncio
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from gui.database.base import BaseModel
+from gui.services.chat import ChatService
+from gui.services.history import HistoryStore
+from gui.services.ollama import AiClient
+
+MODEL = "tinyllama:latest"
+
+
+async def database(path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(BaseModel.metadata.create_all)
+    return engine, sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+def test_compacted_history_reloads_from_a_fresh_store(ollama, tmp_path):
+    turns = [
+        [
+            {"role": "user", "content": f"q{i} " * 40},
+            {"role": "assistant", "content": f"a{i}"},
+        ]
+        for i in range(8)
+    ]
+
+    async def run():
+        engine, session = await database(tmp_path / "chat.db")
+        async with AiClient(ollama.base_url) as client:
+            store = HistoryStore(session, client, MODEL, max_tokens=200, keep_recent=4)
+            for turn in turns:
+                await store.append("s", turn)
+            await store.close()
+            before = await store.load("s")
+            fresh = await HistoryStore(session, client, MODEL).load("s")
+        await engine.dispose()
+        return before, fresh
+
+    before, fresh = asyncio.run(run())
+    assert before[0]["role"] == "system" and "Summary" in before[0]["content"]
+    assert len(before) < 1 + 2 * len(turns)
+    assert fresh == before
+
+
+def test_evicted_sessions_release_their_threads(ollama, tmp_path):
+    async def run():
+        engine, session = await database(tmp_path / "chat.db")
+        async with AiClient(ollama.base_url) as client:
+            store = HistoryStore(session, client, MODEL, flush_interval=60)
+            service = ChatService(client, MODEL, store=store, session_ttl=0)
+            for session_id in ("a", "b", "c"):
+                async for _ in service.reply(session_id, "hi"):
+                    pass
+            await service.session("d")
+            threads = set(store._threads)
+            history = await HistoryStore(session, client, MODEL).load("a")
+            await store.close()
+        await engine.dispose()
+        return threads, history
+
+    threads, history = asyncio.run(run())
+    assert threads == {"d"}
+    assert [m["role"] for m in history] == ["user", "assistant"]
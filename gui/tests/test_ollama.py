@@ -0,0 +1,41 @@
+import asyncio
+
+from gui.services.ollama import AiClient
+
+MODEL = "tinyllama:latest"
+
+
+async def generate(client: AiClient) -> list[str]:
+    return [chunk async for chunk in await client.generate("hi", MODEL, stream=True)]
+
+
+def assert_ok(chunks: list[str]) -> None:
+    assert chunks
+    assert not any(chunk.startswith("Error:") for chunk in chunks), chunks
+
+
+def test_async_after_run_sync(ollama):
+    client = AiClient(ollama.base_url)
+    assert_ok(client.run_sync("generate", "hi", MODEL, stream=True))
+    assert_ok(asyncio.run(generate(client)))
+    client.run_sync("close")
+
+
+def test_run_sync_after_async(ollama):
+    client = AiClient(ollama.base_url)
+    assert_ok(asyncio.run(generate(client)))
+    assert_ok(asyncio.run(generate(client)))
+    assert_ok(client.run_sync("generate", "hi", MODEL, stream=True))
+    client.run_sync("close")
+
+
+def test_close_releases_the_portal_pool(ollama):
+    client = AiClient(ollama.base_url)
+    client.run_sync("generate", "hi", MODEL)
+
+    async def run():
+        assert_ok(await generate(client))
+        await client.close()
+
+    asyncio.run(run())
+    assert not client._pools
@@ -1,18 +1,19 @@
+import asyncio
 import os
 import httpx
 import chromadb
-import fitz  # PyMuPDF
 from chromadb.config import Settings
 
+from gui.services.chat import ChatServer, ChatService, chroma_retriever
+from gui.services.ollama import AiClient
+from gui.services.pdf import PdfExtractor
+from gui.utils.vectors import as_numpy, to_float32
+
 # Constants
 DATA_DIR = "./docs"
 EMBED_MODEL = "nomic-embed-text"
 CHAT_MODEL = "tinyllama:latest"
 
-# Initialize Chroma
-client = chromadb.Client(Settings(persist_directory="./chroma_data"))
-collection = client.get_or_create_collection("file_docs")
-
 
 def get_embedding(text):
     response = httpx.post(
@@ -30,10 +31,10 @@ def get_embedding(text):
     if not embedding:
         raise ValueError("Embedding not found in Ollama response.")
 
-    return embedding
+    return as_numpy(to_float32(embedding))
 
 
-def extract_texts(directory):
+def extract_texts(directory, extractor):
     """Load and extract text from .txt, .md, .pdf files."""
     texts = []
     text_files = (".txt", ".md")
@@ -43,15 +44,15 @@ def extract_texts(directory):
             with open(path, "r", encoding="utf-8") as f:
                 texts.append((filename, f.read()))
         elif filename.endswith(".pdf"):
-            doc = fitz.open(path)
-            pdf_text = "\n".join(page.get_text() for page in doc)
-            texts.append((filename, pdf_text))
+            # Pages are extracted in parallel and cached per (file hash, page).
+            texts.append((filename, extractor.extract(path)))
     return texts
 
 
 def ingest_documents(directory):
     """Ingest and index documents from the directory into Chroma."""
-    documents = extract_texts(directory)
+    with PdfExtractor() as extractor:
+        documents = extract_texts(directory, extractor)
     chunk_size = 512
     for name, content in documents:
         chunks = [
@@ -64,30 +65,26 @@ def ingest_documents(directory):
     print("Ingestion complete.")
 
 
-# Ingest once at start
-ingest_documents(DATA_DIR)
-
+# Chat server: many concurrent sessions, tokens streamed over SSE.
+# curl -N -d '{"content": "hi"}' localhost:8000/sessions/demo/messages
+async def serve():
+    async with AiClient() as ai:
+        service = ChatService(
+            ai,
+            CHAT_MODEL,
+            retriever=chroma_retriever(collection, ai, EMBED_MODEL),
+            max_concurrency=8,
+        )
+        await ChatServer(service).serve()
 
-# Chat loop
-while True:
-    query = input("\nYou: ")
-    emb = get_embedding(query)
-    results = collection.query(query_embeddings=[emb], n_results=3)
 
-    context_docs = results["documents"][0]
-    print(context_docs)
-    context = "\n---\n".join(context_docs)
-    prompt = f"""You are an assistant answering based on the provided context.
-Context:
-{context}
+# Guarded so PDF worker processes can import this module safely.
+if __name__ == "__main__":
+    # Initialize Chroma
+    client = chromadb.Client(Settings(persist_directory="./chroma_data"))
+    collection = client.get_or_create_collection("file_docs")
 
-User: {query}
-Assistant:"""
-
-    res = httpx.post(
-        "http://localhost:11434/api/generate",
-        json={"model": CHAT_MODEL, "prompt": prompt, "stream": False},
-        timeout=60.0,
-    )
+    # Ingest once at start
+    ingest_documents(DATA_DIR)
 
-    print("Bot:", res.json().get("response"))
+    asyncio.run(serve())